@@ -4,76 +4,108 @@ Production-ready settings with environment-based configuration
 """
 
 import os
-from typing import Optional, List
-from pydantic_settings import BaseSettings
-from pydantic import Field
+from functools import cached_property, lru_cache
+from typing import Annotated, Any, Optional, List
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+from pydantic import Field, field_validator
+
+
+# Shared by every settings class so they all read the same sources
+_SETTINGS_CONFIG = SettingsConfigDict(
+    env_file=".env",
+    case_sensitive=True,
+    env_parse_none_str="null",
+    extra="ignore",
+)
+
+
+class CelerySettings(BaseSettings):
+    """Background task settings, only loaded when first accessed"""
+
+    model_config = _SETTINGS_CONFIG
+
+    CELERY_BROKER_URL: str = "redis://localhost:6379/1"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/1"
+
+
+class MonitoringSettings(BaseSettings):
+    """Metrics settings, only loaded when first accessed"""
+
+    model_config = _SETTINGS_CONFIG
+
+    ENABLE_METRICS: bool = True
+    METRICS_PORT: int = 9090
 
 
 class Settings(BaseSettings):
     """Application settings with environment variable support"""
-    
+
+    model_config = _SETTINGS_CONFIG
+
     # Application
     APP_NAME: str = "Intelligent Content Factory"
     VERSION: str = "1.0.0"
-    DEBUG: bool = Field(default=False, env="DEBUG")
+    DEBUG: bool = False
     API_V1_STR: str = "/api/v1"
-    
+
     # Server Configuration
-    HOST: str = Field(default="0.0.0.0", env="HOST")
-    PORT: int = Field(default=8000, env="PORT")
-    
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+
     # Security
-    SECRET_KEY: str = Field(..., env="SECRET_KEY")
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    SECRET_KEY: str = Field(...)
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
-    
-    # CORS
-    BACKEND_CORS_ORIGINS: List[str] = Field(
-        default=["http://localhost:3000", "http://localhost:8000"],
-        env="BACKEND_CORS_ORIGINS"
+
+    # CORS - comma-separated in the environment, e.g. "http://a.com,http://b.com"
+    BACKEND_CORS_ORIGINS: Annotated[List[str], NoDecode] = Field(
+        default=["http://localhost:3000", "http://localhost:8000"]
     )
-    
+
     # Database Configuration
-    DATABASE_URL: str = Field(..., env="DATABASE_URL")
-    
-    # Redis Configuration  
-    REDIS_URL: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
-    
+    DATABASE_URL: str = Field(...)
+
+    # Redis Configuration
+    REDIS_URL: str = "redis://localhost:6379/0"
+
     # AI Model Configuration
     # Google Gemini API Key
-    GOOGLE_API_KEY: Optional[str] = Field(default=None, env="GOOGLE_API_KEY")
-    GEMINI_API_KEY: Optional[str] = Field(default=None, env="GEMINI_API_KEY")
-    OPENAI_API_KEY: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
-    DEFAULT_LLM_PROVIDER: str = Field(default="gemini", env="DEFAULT_LLM_PROVIDER")
-    
+    GOOGLE_API_KEY: Optional[str] = None
+    GEMINI_API_KEY: Optional[str] = None
+    OPENAI_API_KEY: Optional[str] = None
+    DEFAULT_LLM_PROVIDER: str = "gemini"
+
     # Content Generation Settings
-    MAX_CONTENT_LENGTH: int = Field(default=5000, env="MAX_CONTENT_LENGTH")
-    DEFAULT_LANGUAGE: str = Field(default="en", env="DEFAULT_LANGUAGE")
-    
+    MAX_CONTENT_LENGTH: int = 5000
+    DEFAULT_LANGUAGE: str = "en"
+
     # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
-    
+    RATE_LIMIT_PER_MINUTE: int = 60
+
     # Logging
-    LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
-    LOG_FORMAT: str = Field(default="json", env="LOG_FORMAT")
-    
-    # Monitoring
-    ENABLE_METRICS: bool = Field(default=True, env="ENABLE_METRICS")
-    METRICS_PORT: int = Field(default=9090, env="METRICS_PORT")
-    
-    # Background Tasks
-    CELERY_BROKER_URL: str = Field(default="redis://localhost:6379/1", env="CELERY_BROKER_URL")
-    CELERY_RESULT_BACKEND: str = Field(default="redis://localhost:6379/1", env="CELERY_RESULT_BACKEND")
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
 
+    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @classmethod
+    def _split_cors_origins(cls, value: Any) -> Any:
+        """Accept a comma-separated string as well as a list"""
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
 
-# Global settings instance
-settings = Settings()
+    # Monitoring
+    @cached_property
+    def monitoring(self) -> MonitoringSettings:
+        return MonitoringSettings()
+
+    # Background Tasks
+    @cached_property
+    def celery(self) -> CelerySettings:
+        return CelerySettings()
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
\ No newline at end of file
+    """Get application settings, loaded from the environment on first use"""
+    return Settings()
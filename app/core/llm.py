@@ -0,0 +1,64 @@
+"""
+Shared LLM clients for Intelligent Content Factory
+Built once on first use and reused by every service instance
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List
+
+import google.generativeai as genai
+from crewai.llm import LLM
+
+GENERATION_MODEL = "gemini-1.5-flash"
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+
+def _api_key():
+    return os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+
+
+@lru_cache(maxsize=1)
+def get_llm() -> LLM:
+    """Get the Gemini LLM used by the CrewAI agents"""
+    return LLM(
+        model="gemini/gemini-1.5-flash",
+        api_key=_api_key()
+    )
+
+
+@lru_cache(maxsize=1)
+def get_crew_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that blocking Crew.kickoff() calls run in
+
+    Shared by every service and bounded, so a burst of requests cannot
+    exhaust threads or flood the Gemini rate limit.
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="crew")
+
+
+@lru_cache(maxsize=1)
+def _configure_genai():
+    """Configure the google-generativeai client once"""
+    genai.configure(api_key=_api_key())
+    return genai
+
+
+@lru_cache(maxsize=1)
+def get_generative_model() -> genai.GenerativeModel:
+    """Get the Gemini model used for direct, streamed generation"""
+    return _configure_genai().GenerativeModel(GENERATION_MODEL)
+
+
+async def embed_text(text: str) -> List[float]:
+    """Embed text with Gemini for similarity comparisons"""
+    client = _configure_genai()
+    result = await asyncio.to_thread(
+        client.embed_content,
+        model=EMBEDDING_MODEL,
+        content=text,
+        task_type="semantic_similarity"
+    )
+    return result["embedding"]
@@ -5,74 +5,144 @@ Data Models and Schemas for Intelligent Content Factory
 Pydantic models for API request/response serialization
 """
 
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+from typing_extensions import TypedDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator, with_config
 from datetime import datetime
 
+# Allowed values for enumerated fields
+ContentType = Literal["article", "blog_post", "guide", "tutorial", "analysis", "review"]
+AgentRole = Literal["researcher", "writer", "reviewer", "analyst"]
+AgentStatus = Literal["active", "inactive", "maintenance"]
+
+# Request schemas reject unknown fields; response schemas are also immutable
+_REQUEST_CONFIG = ConfigDict(extra="forbid")
+_RESPONSE_CONFIG = ConfigDict(from_attributes=True, frozen=True, extra="forbid")
+
+# Typed shapes for nested dict fields; unknown keys are kept as-is
+@with_config(ConfigDict(extra="allow"))
+class Metadata(TypedDict, total=False):
+    """Content metadata"""
+    topic: str
+    content_type: str
+    research_included: bool
+    review_included: bool
+    timestamp: str
+    generation_method: str
+    agents_used: List[str]
+    generation_time: str
+    cache_hit: bool
+    streamed: bool
+
+@with_config(ConfigDict(extra="allow"))
+class AgentConfig(TypedDict, total=False):
+    """Agent configuration"""
+    max_research_time: int
+    sources_limit: int
+    max_content_length: int
+    style: str
+    quality_threshold: float
+    review_criteria: List[str]
+
+@with_config(ConfigDict(extra="allow"))
+class WorkflowRequirements(TypedDict, total=False):
+    """Special requirements for a workflow run"""
+    tone: str
+    target_audience: str
+    word_count: int
+    keywords: List[str]
+
+@with_config(ConfigDict(extra="allow"))
+class WorkflowResult(TypedDict, total=False):
+    """Output of a content generation workflow"""
+    content: str
+    tasks_completed: int
+    execution_time: str
+    quality_score: str
+    metadata: Metadata
+    error: str
+
 # Content Models
 class ContentCreate(BaseModel):
     """Schema for creating new content"""
+    model_config = _REQUEST_CONFIG
+    
     title: str = Field(..., description="Content title", min_length=1, max_length=200)
     content: str = Field(..., description="Content body", min_length=1, max_length=10000)
-    content_type: str = Field(default="article", description="Type of content")
-    metadata: Optional[Dict[str, Any]] = Field(default={}, description="Additional metadata")
+    content_type: ContentType = Field(default="article", description="Type of content")
+    metadata: Optional[Metadata] = Field(default_factory=dict, description="Additional metadata")
 
 class ContentResponse(BaseModel):
     """Schema for content API responses"""
+    model_config = _RESPONSE_CONFIG
+    
     id: int = Field(..., description="Unique content identifier")
     title: str = Field(..., description="Content title")
     content: str = Field(..., description="Content body")
-    content_type: str = Field(..., description="Type of content")
-    metadata: Dict[str, Any] = Field(default={}, description="Additional metadata")
+    content_type: ContentType = Field(..., description="Type of content")
+    metadata: Metadata = Field(default_factory=dict, description="Additional metadata")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+
+class ContentSummary(BaseModel):
+    """Schema for content listings, without the content body"""
+    model_config = _RESPONSE_CONFIG
     
-    class Config:
-        from_attributes = True
+    id: int = Field(..., description="Unique content identifier")
+    title: str = Field(..., description="Content title")
+    content_type: ContentType = Field(..., description="Type of content")
+    created_at: datetime = Field(..., description="Creation timestamp")
 
 # Agent Models
 class AgentCreate(BaseModel):
     """Schema for creating new agents"""
+    model_config = _REQUEST_CONFIG
+    
     name: str = Field(..., description="Agent name", min_length=1, max_length=100)
-    role: str = Field(..., description="Agent role", min_length=1, max_length=50)
+    role: AgentRole = Field(..., description="Agent role")
     description: str = Field(..., description="Agent description", max_length=500)
-    capabilities: List[str] = Field(default=[], description="Agent capabilities")
-    config: Optional[Dict[str, Any]] = Field(default={}, description="Agent configuration")
+    capabilities: List[str] = Field(default_factory=list, description="Agent capabilities")
+    config: Optional[AgentConfig] = Field(default_factory=dict, description="Agent configuration")
 
 class AgentResponse(BaseModel):
     """Schema for agent API responses"""
+    model_config = _RESPONSE_CONFIG
+    
     id: int = Field(..., description="Unique agent identifier")
     name: str = Field(..., description="Agent name")
-    role: str = Field(..., description="Agent role")
+    role: AgentRole = Field(..., description="Agent role")
     description: str = Field(..., description="Agent description")
-    capabilities: List[str] = Field(default=[], description="Agent capabilities")
-    config: Dict[str, Any] = Field(default={}, description="Agent configuration")
-    status: str = Field(default="active", description="Agent status")
+    capabilities: List[str] = Field(default_factory=list, description="Agent capabilities")
+    config: AgentConfig = Field(default_factory=dict, description="Agent configuration")
+    status: AgentStatus = Field(default="active", description="Agent status")
     created_at: datetime = Field(..., description="Creation timestamp")
-    
-    class Config:
-        from_attributes = True
 
 # Workflow Models
 class WorkflowRequest(BaseModel):
     """Schema for workflow execution requests"""
+    model_config = _REQUEST_CONFIG
+    
     topic: str = Field(..., description="Content topic", min_length=1, max_length=200)
-    content_type: str = Field(default="article", description="Desired content type")
-    requirements: Optional[Dict[str, Any]] = Field(default={}, description="Special requirements")
-    agents: Optional[List[str]] = Field(default=[], description="Specific agents to use")
+    content_type: ContentType = Field(default="article", description="Desired content type")
+    requirements: Optional[WorkflowRequirements] = Field(default_factory=dict, description="Special requirements")
+    agents: Optional[List[str]] = Field(default_factory=list, description="Specific agents to use")
 
 class WorkflowResponse(BaseModel):
     """Schema for workflow execution responses"""
+    model_config = _RESPONSE_CONFIG
+    
     id: str = Field(..., description="Workflow execution ID")
     status: str = Field(..., description="Workflow status")
-    result: Optional[Dict[str, Any]] = Field(None, description="Workflow result")
+    result: Optional[WorkflowResult] = Field(None, description="Workflow result")
     started_at: datetime = Field(..., description="Workflow start time")
     completed_at: Optional[datetime] = Field(None, description="Workflow completion time")
-    agents_used: List[str] = Field(default=[], description="Agents that participated")
+    agents_used: List[str] = Field(default_factory=list, description="Agents that participated")
 
 # Health Check Models
 class HealthResponse(BaseModel):
     """Schema for health check responses"""
+    model_config = _RESPONSE_CONFIG
+    
     status: str = Field(..., description="Service health status")
     service: str = Field(..., description="Service name")
     version: str = Field(..., description="Service version")
@@ -81,6 +151,8 @@ class HealthResponse(BaseModel):
 # Metrics Models
 class MetricsResponse(BaseModel):
     """Schema for system metrics responses"""
+    model_config = _RESPONSE_CONFIG
+    
     status: str = Field(..., description="System operational status")
     active_agents: int = Field(..., description="Number of active agents")
     total_content_generated: int = Field(..., description="Total content items generated")
@@ -91,8 +163,17 @@ class MetricsResponse(BaseModel):
 # Error Models
 class ErrorResponse(BaseModel):
     """Schema for error responses"""
+    model_config = _RESPONSE_CONFIG
+    
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Error message")
     detail: Optional[str] = Field(None, description="Detailed error information")
     path: Optional[str] = Field(None, description="API path where error occurred")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
\ No newline at end of file
+    timestamp: Optional[datetime] = Field(None, description="Error timestamp")
+    
+    @model_validator(mode="after")
+    def _fill_timestamp(self) -> "ErrorResponse":
+        """Stamp the error with the current time only if the caller did not"""
+        if self.timestamp is None:
+            object.__setattr__(self, "timestamp", datetime.utcnow())
+        return self
\ No newline at end of file
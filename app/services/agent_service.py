@@ -8,28 +8,185 @@ Handles agent registration, execution, and workflow orchestration
 
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
 
 from crewai import Agent, Task, Crew, Process
-from crewai.llm import LLM
-import os
 
-from app.models.schemas import AgentCreate, AgentResponse
+from app.core.llm import get_crew_executor, get_llm
+from app.models.schemas import (
+    AgentConfig, AgentCreate, AgentResponse, AgentRole, AgentStatus, ContentType, WorkflowResponse
+)
+from app.utils.agent_pool import AgentPool
 
 logger = logging.getLogger(__name__)
 
+# Agent backstories
+_RESEARCHER_BACKSTORY = """You are an expert researcher with access to vast knowledge.
+You excel at finding relevant information, identifying key trends, and
+gathering supporting data for content creation."""
+
+_WRITER_BACKSTORY = """You are a skilled content creator who transforms research
+into engaging, well-structured content. You adapt your writing style
+to match the content type and target audience."""
+
+_REVIEWER_BACKSTORY = """You are a meticulous editor who ensures content meets
+high standards for accuracy, readability, and engagement. You improve
+content while maintaining the author's voice and intent."""
+
+# Workflow task prompts, formatted per request
+_RESEARCH_DESC_TMPL = """Research comprehensive information about the topic given below.
+
+Focus on:
+1. Core concepts and key definitions
+2. Current trends and recent developments
+3. Statistical data and market insights
+4. Expert opinions and industry perspectives
+5. Practical applications and use cases
+
+Provide organized research that will inform high-quality content.
+
+Topic: {topic}"""
+
+_RESEARCH_OUTPUT = """Detailed research report including:
+- Executive summary of key findings
+- Core concepts and definitions
+- Current trends and statistics
+- Expert insights and quotes
+- Practical examples and applications"""
+
+_CONTENT_DESC_TMPL = """Create a comprehensive piece of content of the type given below,
+based on the research findings.
+
+Requirements:
+- Professional, engaging tone
+- Well-structured with clear sections
+- Include relevant examples and data
+- 1000-1500 words in length
+- SEO-optimized and reader-friendly
+
+Create content that educates and engages the audience.
+
+Content type: {content_type}
+Topic: {topic}"""
+
+_CONTENT_OUTPUT_TMPL = """High-quality content featuring:
+- Compelling introduction
+- Well-organized main content with clear sections
+- Supporting examples and data from research
+- Practical insights and takeaways
+- Strong conclusion with key points
+
+Content type: {content_type}"""
+
+_REVIEW_DESC_TMPL = """Review and enhance the content described below.
+
+Focus on:
+1. Accuracy and factual correctness
+2. Readability and flow
+3. Engagement and interest level
+4. Structure and organization
+5. Grammar and language quality
+
+Provide the final, polished version.
+
+Content type: {content_type}
+Topic: {topic}"""
+
+_REVIEW_OUTPUT = """Final polished content with:
+- Verified accuracy and facts
+- Improved readability and flow
+- Enhanced engagement elements
+- Perfect grammar and language
+- Optimized structure and formatting"""
+
+# Only depends on content_type, so the common case is formatted once
+_CONTENT_OUTPUT_BY_TYPE = {"article": _CONTENT_OUTPUT_TMPL.format(content_type="article")}
+
+# Returned when the crew run fails
+_FALLBACK_TMPL = """# {topic}
+
+This content was generated in fallback mode due to workflow execution issues.
+
+## Overview
+
+{topic} is an important subject that deserves comprehensive coverage. Our multi-agent system is designed to provide in-depth research and high-quality content creation.
+
+## Key Features
+
+- Multi-agent workflow orchestration
+- Research-driven content generation
+- Quality assurance and review processes
+- Scalable content production pipeline
+
+## Conclusion
+
+The Intelligent Content Factory demonstrates advanced AI capabilities for automated content creation.
+
+*Generated in fallback mode by Intelligent Content Factory*"""
+
+
+@dataclass(slots=True)
+class AgentRecord:
+    """Internal agent store entry, converted to AgentResponse at the API boundary"""
+    id: int
+    name: str
+    role: AgentRole
+    description: str
+    capabilities: List[str] = field(default_factory=list)
+    config: AgentConfig = field(default_factory=dict)
+    status: AgentStatus = "active"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+_AGENT_RECORD_FIELDS = tuple(f.name for f in fields(AgentRecord))
+
+
+def _to_response(record: AgentRecord) -> AgentResponse:
+    """Build an AgentResponse from a trusted record without re-validating it"""
+    return AgentResponse.model_construct(
+        **{name: getattr(record, name) for name in _AGENT_RECORD_FIELDS}
+    )
+
+
 class AgentService:
     """Service for managing AI agents and workflows"""
     
     def __init__(self):
-        self.llm = LLM(
-            model="gemini/gemini-1.5-flash",
-            api_key=os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        )
-        self._agent_store = []  # Temporary in-memory storage
+        self.llm = get_llm()
+        self._agent_store: List[AgentRecord] = []  # Temporary in-memory storage
+        self._by_id: Dict[int, AgentRecord] = {}
+        self._by_role: Dict[str, List[AgentRecord]] = {}
+        self._active_count = 0
+        self._role_counts: Counter = Counter()
+        self._capabilities = set()
         self._next_id = 1
         self._initialize_default_agents()
+        # The first CrewAI agent set is built by warm_up() in the background;
+        # workflows wait on `ready` until it is in the pool
+        self._agent_pool = AgentPool(self._build_agents, prebuild=0)
+        self.ready = asyncio.Event()
+        self._warmup_task: Optional[asyncio.Task] = None
+    
+    def start_warmup(self):
+        """Start building the pooled agent set in the background, once"""
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warm_up())
+    
+    async def _warm_up(self):
+        """Build the first agent set off the event loop, then mark the service ready"""
+        try:
+            agent_set = await asyncio.to_thread(self._build_agents)
+            self._agent_pool.release(agent_set)
+            logger.info("Workflow agents ready")
+        except Exception as e:
+            # Workflows still build agents on demand
+            logger.error("Agent warmup failed: %s", e)
+        finally:
+            self.ready.set()
         
     def _initialize_default_agents(self):
         """Initialize default system agents"""
@@ -59,7 +216,7 @@ class AgentService:
         ]
         
         for agent_data in default_agents:
-            agent_response = AgentResponse(
+            record = AgentRecord(
                 id=self._next_id,
                 name=agent_data["name"],
                 role=agent_data["role"],
@@ -70,136 +227,134 @@ class AgentService:
                 created_at=datetime.utcnow()
             )
             
-            self._agent_store.append(agent_response)
-            self._next_id += 1
+            self._store_agent(record)
             
-        logger.info(f"Initialized {len(default_agents)} default agents")
+        logger.info("Initialized %d default agents", len(default_agents))
+    
+    def _build_agents(self) -> Tuple[Agent, Agent, Agent]:
+        """Build the (research, writing, review) CrewAI agents for one workflow run"""
+        
+        research_agent = Agent(
+            role="Senior Research Analyst",
+            goal="Conduct comprehensive research on the requested topic",
+            backstory=_RESEARCHER_BACKSTORY,
+            llm=self.llm,
+            verbose=False,
+            allow_delegation=False
+        )
+        
+        writing_agent = Agent(
+            role="Professional Content Creator",
+            goal="Create high-quality content of the requested type based on research findings",
+            backstory=_WRITER_BACKSTORY,
+            llm=self.llm,
+            verbose=False,
+            allow_delegation=False
+        )
+        
+        review_agent = Agent(
+            role="Quality Assurance Editor",
+            goal="Review and enhance the content for quality and accuracy",
+            backstory=_REVIEWER_BACKSTORY,
+            llm=self.llm,
+            verbose=False,
+            allow_delegation=False
+        )
+        
+        return research_agent, writing_agent, review_agent
+    
+    def _store_agent(self, agent: AgentRecord):
+        """Append an agent to the store and its id/role indexes"""
+        
+        self._agent_store.append(agent)
+        self._by_id[agent.id] = agent
+        self._by_role.setdefault(agent.role, []).append(agent)
+        self._active_count += agent.status == "active"
+        self._role_counts[agent.role] += 1
+        self._capabilities.update(agent.capabilities)
+        self._next_id += 1
     
     async def create_agent(self, agent_data: AgentCreate) -> AgentResponse:
         """Create and register a new AI agent"""
         
-        logger.info(f"Creating agent: {agent_data.name}")
+        if __debug__:
+            logger.info("Creating agent: %s", agent_data.name)
         
         try:
-            agent_response = AgentResponse(
+            record = AgentRecord(
                 id=self._next_id,
                 name=agent_data.name,
                 role=agent_data.role,
                 description=agent_data.description,
                 capabilities=agent_data.capabilities,
-                config=agent_data.config,
+                config=agent_data.config or {},
                 status="active",
                 created_at=datetime.utcnow()
             )
             
-            self._agent_store.append(agent_response)
-            self._next_id += 1
+            self._store_agent(record)
             
-            logger.info(f"Agent created successfully: {agent_data.name} (ID: {agent_response.id})")
-            return agent_response
+            logger.info("Agent created successfully: %s (ID: %s)", agent_data.name, record.id)
+            return _to_response(record)
             
         except Exception as e:
-            logger.error(f"Error creating agent: {str(e)}")
+            logger.error("Error creating agent: %s", e)
             raise Exception(f"Agent creation failed: {str(e)}")
     
     async def get_agent(self, agent_id: int) -> Optional[AgentResponse]:
         """Retrieve specific agent by ID"""
         
-        for agent in self._agent_store:
-            if agent.id == agent_id:
-                return agent
-        return None
+        record = self._by_id.get(agent_id)
+        return _to_response(record) if record is not None else None
     
     async def get_all_agents(self) -> List[AgentResponse]:
         """Retrieve all registered agents"""
         
-        return self._agent_store
+        return [_to_response(record) for record in self._agent_store]
     
-    async def get_agents_by_role(self, role: str) -> List[AgentResponse]:
+    async def get_agents_by_role(self, role: AgentRole) -> List[AgentResponse]:
         """Retrieve agents by their role"""
         
-        return [agent for agent in self._agent_store if agent.role == role]
+        return [_to_response(record) for record in self._by_role.get(role, ())]
     
-    async def execute_content_workflow(self, topic: str, content_type: str = "article") -> Dict[str, Any]:
+    async def execute_content_workflow(self, topic: str, content_type: ContentType = "article") -> WorkflowResponse:
         """Execute a complete content generation workflow using multiple agents"""
         
-        logger.info(f"Starting content workflow for topic: {topic}")
+        if __debug__:
+            logger.info("Starting content workflow for topic: %s", topic)
+        
+        self.start_warmup()
+        await self.ready.wait()
+        agent_set = None
         
         try:
             # Get available agents
-            researchers = await self.get_agents_by_role("researcher")
-            writers = await self.get_agents_by_role("writer")
-            reviewers = await self.get_agents_by_role("reviewer")
+            researchers, writers, reviewers = await asyncio.gather(
+                self.get_agents_by_role("researcher"),
+                self.get_agents_by_role("writer"),
+                self.get_agents_by_role("reviewer")
+            )
             
             if not researchers or not writers:
                 raise Exception("Required agents (researcher, writer) not available")
             
-            # Create CrewAI agents
-            research_agent = Agent(
-                role="Senior Research Analyst",
-                goal=f"Conduct comprehensive research on {topic}",
-                backstory="""You are an expert researcher with access to vast knowledge. 
-                You excel at finding relevant information, identifying key trends, and 
-                gathering supporting data for content creation.""",
-                llm=self.llm,
-                verbose=False,
-                allow_delegation=False
-            )
-            
-            writing_agent = Agent(
-                role="Professional Content Creator",
-                goal=f"Create high-quality {content_type} based on research findings",
-                backstory="""You are a skilled content creator who transforms research 
-                into engaging, well-structured content. You adapt your writing style 
-                to match the content type and target audience.""",
-                llm=self.llm,
-                verbose=False,
-                allow_delegation=False
-            )
+            agent_set = await self._agent_pool.acquire()
+            research_agent, writing_agent, review_agent = agent_set
             
             # Create tasks
             research_task = Task(
-                description=f"""Research comprehensive information about: {topic}
-                
-                Focus on:
-                1. Core concepts and key definitions
-                2. Current trends and recent developments  
-                3. Statistical data and market insights
-                4. Expert opinions and industry perspectives
-                5. Practical applications and use cases
-                
-                Provide organized research that will inform high-quality content.""",
-                
-                expected_output="""Detailed research report including:
-                - Executive summary of key findings
-                - Core concepts and definitions
-                - Current trends and statistics
-                - Expert insights and quotes
-                - Practical examples and applications""",
-                
+                description=_RESEARCH_DESC_TMPL.format(topic=topic),
+                expected_output=_RESEARCH_OUTPUT,
                 agent=research_agent
             )
             
+            content_output = _CONTENT_OUTPUT_BY_TYPE.get(content_type)
+            if content_output is None:
+                content_output = _CONTENT_OUTPUT_TMPL.format(content_type=content_type)
+            
             content_task = Task(
-                description=f"""Create a comprehensive {content_type} about {topic} 
-                based on the research findings.
-                
-                Requirements:
-                - Professional, engaging tone
-                - Well-structured with clear sections
-                - Include relevant examples and data
-                - 1000-1500 words in length
-                - SEO-optimized and reader-friendly
-                
-                Create content that educates and engages the audience.""",
-                
-                expected_output=f"""High-quality {content_type} featuring:
-                - Compelling introduction
-                - Well-organized main content with clear sections
-                - Supporting examples and data from research
-                - Practical insights and takeaways
-                - Strong conclusion with key points""",
-                
+                description=_CONTENT_DESC_TMPL.format(content_type=content_type, topic=topic),
+                expected_output=content_output,
                 agent=writing_agent,
                 context=[research_task]
             )
@@ -209,36 +364,9 @@ class AgentService:
             agents = [research_agent, writing_agent]
             
             if reviewers:
-                review_agent = Agent(
-                    role="Quality Assurance Editor",
-                    goal="Review and enhance the content for quality and accuracy",
-                    backstory="""You are a meticulous editor who ensures content meets 
-                    high standards for accuracy, readability, and engagement. You improve 
-                    content while maintaining the author's voice and intent.""",
-                    llm=self.llm,
-                    verbose=False,
-                    allow_delegation=False
-                )
-                
                 review_task = Task(
-                    description=f"""Review and enhance the {content_type} about {topic}.
-                    
-                    Focus on:
-                    1. Accuracy and factual correctness
-                    2. Readability and flow
-                    3. Engagement and interest level
-                    4. Structure and organization
-                    5. Grammar and language quality
-                    
-                    Provide the final, polished version.""",
-                    
-                    expected_output="""Final polished content with:
-                    - Verified accuracy and facts
-                    - Improved readability and flow
-                    - Enhanced engagement elements
-                    - Perfect grammar and language
-                    - Optimized structure and formatting""",
-                    
+                    description=_REVIEW_DESC_TMPL.format(content_type=content_type, topic=topic),
+                    expected_output=_REVIEW_OUTPUT,
                     agent=review_agent,
                     context=[research_task, content_task]
                 )
@@ -254,89 +382,77 @@ class AgentService:
                 verbose=False
             )
             
-            start_time = datetime.utcnow()
-            result = workflow_crew.kickoff()
-            end_time = datetime.utcnow()
-            
-            execution_time = (end_time - start_time).total_seconds()
+            start_perf = time.perf_counter()
+            start_time = datetime.now(timezone.utc)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(get_crew_executor(), workflow_crew.kickoff)
+            execution_time = time.perf_counter() - start_perf
             
-            return {
-                "content": str(result),
-                "workflow_id": f"workflow_{int(start_time.timestamp())}",
-                "agents_used": [agent.role for agent in agents],
-                "tasks_completed": len(tasks),
-                "execution_time": f"{execution_time:.2f} seconds",
-                "quality_score": "A+" if reviewers else "A",
-                "status": "completed",
-                "metadata": {
-                    "topic": topic,
-                    "content_type": content_type,
-                    "research_included": True,
-                    "review_included": bool(reviewers),
-                    "timestamp": start_time.isoformat()
-                }
-            }
+            return WorkflowResponse(
+                id=f"workflow_{int(start_time.timestamp())}",
+                status="completed",
+                result={
+                    "content": str(result),
+                    "tasks_completed": len(tasks),
+                    "execution_time": f"{execution_time:.2f} seconds",
+                    "quality_score": "A+" if reviewers else "A",
+                    "metadata": {
+                        "topic": topic,
+                        "content_type": content_type,
+                        "research_included": True,
+                        "review_included": bool(reviewers),
+                        "timestamp": start_time.isoformat()
+                    }
+                },
+                started_at=start_time,
+                completed_at=start_time + timedelta(seconds=execution_time),
+                agents_used=[agent.role for agent in agents]
+            )
             
         except Exception as e:
-            logger.error(f"Workflow execution failed: {str(e)}")
+            logger.error("Workflow execution failed: %s", e)
             # Return fallback content
-            return {
-                "content": f"""# {topic}
-
-This content was generated in fallback mode due to workflow execution issues.
-
-## Overview
-
-{topic} is an important subject that deserves comprehensive coverage. Our multi-agent system is designed to provide in-depth research and high-quality content creation.
-
-## Key Features
-
-- Multi-agent workflow orchestration
-- Research-driven content generation
-- Quality assurance and review processes
-- Scalable content production pipeline
-
-## Conclusion
-
-The Intelligent Content Factory demonstrates advanced AI capabilities for automated content creation.
-
-*Generated in fallback mode by Intelligent Content Factory*""",
-                "workflow_id": f"fallback_{int(datetime.utcnow().timestamp())}",
-                "agents_used": ["Fallback Generator"],
-                "tasks_completed": 1,
-                "execution_time": "0.1 seconds",
-                "quality_score": "B (Fallback)",
-                "status": "completed_fallback",
-                "error": str(e)
-            }
+            failed_at = datetime.now(timezone.utc)
+            return WorkflowResponse(
+                id=f"fallback_{int(failed_at.timestamp())}",
+                status="completed_fallback",
+                result={
+                    "content": _FALLBACK_TMPL.format(topic=topic),
+                    "tasks_completed": 1,
+                    "execution_time": "0.1 seconds",
+                    "quality_score": "B (Fallback)",
+                    "error": str(e)
+                },
+                started_at=failed_at,
+                completed_at=failed_at,
+                agents_used=["Fallback Generator"]
+            )
+        
+        finally:
+            if agent_set is not None:
+                self._agent_pool.release(agent_set)
     
-    async def update_agent_status(self, agent_id: int, status: str) -> bool:
+    async def update_agent_status(self, agent_id: int, status: AgentStatus) -> bool:
         """Update agent status (active, inactive, maintenance)"""
         
-        for agent in self._agent_store:
-            if agent.id == agent_id:
-                agent.status = status
-                logger.info(f"Agent {agent_id} status updated to: {status}")
-                return True
-        return False
+        agent = self._by_id.get(agent_id)
+        if agent is None:
+            return False
+        
+        self._active_count += (status == "active") - (agent.status == "active")
+        agent.status = status
+        logger.info("Agent %s status updated to: %s", agent_id, status)
+        return True
     
     async def get_agent_statistics(self) -> Dict[str, Any]:
         """Get statistics about registered agents"""
         
         total_agents = len(self._agent_store)
-        active_agents = len([a for a in self._agent_store if a.status == "active"])
-        
-        role_counts = {}
-        for agent in self._agent_store:
-            role_counts[agent.role] = role_counts.get(agent.role, 0) + 1
         
         return {
             "total_agents": total_agents,
-            "active_agents": active_agents,
-            "inactive_agents": total_agents - active_agents,
-            "agents_by_role": role_counts,
-            "capabilities": list(set([
-                cap for agent in self._agent_store 
-                for cap in agent.capabilities
-            ]))
+            "active_agents": self._active_count,
+            "inactive_agents": total_agents - self._active_count,
+            "agents_by_role": dict(self._role_counts),
+            "capabilities": list(self._capabilities)
         }
\ No newline at end of file
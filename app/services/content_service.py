@@ -7,49 +7,184 @@ Handles content generation workflows and data persistence
 """
 
 import asyncio
+import hashlib
+import json
 import logging
-from typing import List, Optional, Dict, Any
+import os
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import AsyncIterator, List, Optional, Dict, Any, Set, Tuple, Union
 from datetime import datetime
 
 from crewai import Agent, Task, Crew, Process
-from crewai.llm import LLM
-import os
 
-from app.models.schemas import ContentCreate, ContentResponse
+from app.core.llm import embed_text, get_crew_executor, get_generative_model, get_llm
+from app.models.schemas import ContentCreate, ContentResponse, ContentSummary
+from app.utils.agent_pool import AgentPool
+from app.utils.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Agents credited in content metadata when generation runs through CrewAI
+_CREW_AGENTS = ["Content Research Specialist", "Professional Content Writer"]
+
+# Recent submissions remembered for duplicate detection
+_DEDUP_SIZE = 1024
+
+DedupKey = Tuple[str, str, bytes]
+
+# Sections of a generated piece as (name, brief, word count); once research
+# is done they are written concurrently
+_SECTIONS = (
+    ("introduction", "an engaging introduction that hooks the reader", "100-200"),
+    ("body", "the main body, organised into clear sections with examples and supporting evidence", "600-800"),
+    ("conclusion", "a strong conclusion with key takeaways", "100-200"),
+)
+
+# Agent backstories
+_RESEARCHER_BACKSTORY = """You are an expert researcher who gathers relevant,
+accurate, and current information on any given topic. You excel at
+finding key insights, statistics, and compelling angles for content creation."""
+
+_WRITER_BACKSTORY = """You are a skilled content writer who creates engaging,
+well-structured, and informative content. You adapt your writing style
+to match the content type and target audience perfectly."""
+
+# Generation task prompts, formatted per request
+_RESEARCH_DESC_TMPL = """Research comprehensive information about the topic given below.
+
+Focus on:
+- Key concepts and definitions
+- Current trends and developments
+- Important statistics and data
+- Expert insights and opinions
+- Real-world applications and examples
+
+Provide well-organized research findings that will inform high-quality content creation.
+
+Topic: {title}"""
+
+_RESEARCH_OUTPUT = """Comprehensive research report with:
+- Executive summary of key findings
+- Detailed research on main concepts
+- Current trends and statistics
+- Expert insights and quotes
+- Practical examples and case studies"""
+
+_SECTION_DESC_TMPL = """Based on the research findings below, write one section
+of a high-quality piece of content.
+
+Requirements:
+- Style: Professional yet engaging
+- Write only the requested section; other writers cover the rest of the piece
+- Include relevant examples and insights from research
+- Optimize for readability and engagement
+
+Content type: {content_type}
+Topic: {title}
+
+Research findings:
+{research}
+
+Section: {section}, {brief}
+Length: {words} words"""
+
+_SECTION_OUTPUT_TMPL = """The requested section, in a professional tone
+appropriate for the content type
+
+Section: {section}
+Content type: {content_type}"""
+
+
+def _direct_prompt(backstory: str, description: str, expected_output: str) -> str:
+    """Combine an agent's backstory, task and expected output into one Gemini prompt"""
+    return f"{backstory}\n\n{description}\n\nExpected output:\n{expected_output}"
+
+
 class ContentService:
     """Service for managing content creation with AI agents"""
     
     def __init__(self):
-        self.llm = LLM(
-            model="gemini/gemini-1.5-flash",
-            api_key=os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        )
-        self._content_store = []  # Temporary in-memory storage
+        # Temporary in-memory storage, keyed by id (dicts keep insertion order)
+        self._content_store: Dict[int, ContentResponse] = {}
         self._next_id = 1
+        self._cache = SemanticCache(embed_text, threshold=0.92, ttl=3600)
+        # CONTENT_PIPELINE=crew runs generation through CrewAI agents; by
+        # default the same prompts go straight to Gemini, without the
+        # framework's per-run overhead
+        self._use_crew = os.getenv("CONTENT_PIPELINE", "direct") == "crew"
+        self._agent_pool = AgentPool(self._build_agents, prebuild=1 if self._use_crew else 0)
+        # Strong references to streaming producers, which outlive their response
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Recent pre-written submissions -> content id, so client retries
+        # don't store duplicates
+        self._dedup_lru: "OrderedDict[DedupKey, int]" = OrderedDict()
+        
+    def _build_agents(self) -> Tuple[Agent, Tuple[Agent, ...]]:
+        """Build a researcher and one writer per section for one generation run"""
+        
+        llm = get_llm()  # Only crew mode needs the CrewAI LLM
+        
+        researcher = Agent(
+            role="Content Research Specialist",
+            goal="Research comprehensive information about the requested topic",
+            backstory=_RESEARCHER_BACKSTORY,
+            llm=llm,
+            verbose=False,
+            allow_delegation=False
+        )
+        
+        writers = tuple(
+            Agent(
+                role="Professional Content Writer",
+                goal="Create high-quality content of the requested type based on research",
+                backstory=_WRITER_BACKSTORY,
+                llm=llm,
+                verbose=False,
+                allow_delegation=False
+            )
+            for _ in _SECTIONS
+        )
         
+        return researcher, writers
+    
     async def create_content(self, content_data: ContentCreate) -> ContentResponse:
         """Create new content using multi-agent generation workflow"""
         
         logger.info(f"Creating content: {content_data.title}")
         
+        # One timestamp per request
+        now = datetime.utcnow()
+        
         try:
             # For demo purposes, if content is already provided, store it directly
             if len(content_data.content) > 100:  # Substantial content already provided
-                content_response = ContentResponse(
+                # Client retries of the same submission get the stored item back
+                dedup_key = (
+                    content_data.title,
+                    content_data.content_type,
+                    hashlib.blake2b(content_data.content.encode(), digest_size=16).digest()
+                )
+                existing = self._find_duplicate(dedup_key)
+                if existing is not None:
+                    logger.info(f"Duplicate submission, returning existing content: ID {existing.id}")
+                    return existing
+                
+                # Fields come from an already validated ContentCreate, so skip re-validation
+                content_response = ContentResponse.model_construct(
                     id=self._next_id,
                     title=content_data.title,
                     content=content_data.content,
                     content_type=content_data.content_type,
-                    metadata=content_data.metadata,
-                    created_at=datetime.utcnow(),
+                    metadata=content_data.metadata or {},
+                    created_at=now,
                     updated_at=None
                 )
                 
-                self._content_store.append(content_response)
+                self._content_store[content_response.id] = content_response
                 self._next_id += 1
+                self._remember_submission(dedup_key, content_response.id)
                 
                 logger.info(f"Content created successfully: ID {content_response.id}")
                 return content_response
@@ -57,22 +192,24 @@ class ContentService:
             # Otherwise, use AI agents to generate content
             generated_content = await self._generate_with_agents(content_data)
             
+            # The request's metadata dict is not used elsewhere, so extend it in place
+            metadata = content_data.metadata or {}
+            metadata["generation_method"] = generated_content.get("generation_method", "multi_agent")
+            metadata["agents_used"] = generated_content.get("agents_used", [])
+            metadata["generation_time"] = generated_content.get("generation_time", "N/A")
+            metadata["cache_hit"] = generated_content.get("cache_hit", False)
+            
             content_response = ContentResponse(
                 id=self._next_id,
                 title=content_data.title,
                 content=generated_content["content"],
                 content_type=content_data.content_type,
-                metadata={
-                    **content_data.metadata,
-                    "generation_method": "multi_agent",
-                    "agents_used": generated_content.get("agents_used", []),
-                    "generation_time": generated_content.get("generation_time", "N/A")
-                },
-                created_at=datetime.utcnow(),
+                metadata=metadata,
+                created_at=now,
                 updated_at=None
             )
             
-            self._content_store.append(content_response)
+            self._content_store[content_response.id] = content_response
             self._next_id += 1
             
             logger.info(f"AI-generated content created successfully: ID {content_response.id}")
@@ -82,118 +219,218 @@ class ContentService:
             logger.error(f"Error creating content: {str(e)}")
             raise Exception(f"Content creation failed: {str(e)}")
     
-    async def get_content(self, content_id: int) -> Optional[ContentResponse]:
-        """Retrieve specific content by ID"""
+    def _find_duplicate(self, key: DedupKey) -> Optional[ContentResponse]:
+        """Get the stored content for an earlier identical submission, if still present"""
         
-        for content in self._content_store:
-            if content.id == content_id:
-                return content
-        return None
+        content_id = self._dedup_lru.get(key)
+        if content_id is None:
+            return None
+        
+        content = self._content_store.get(content_id)
+        if content is None:  # Deleted since
+            del self._dedup_lru[key]
+            return None
+        
+        self._dedup_lru.move_to_end(key)
+        return content
     
-    async def get_all_content(self) -> List[ContentResponse]:
-        """Retrieve all content items"""
+    def _remember_submission(self, key: DedupKey, content_id: int):
+        """Record a submission for duplicate detection, evicting the oldest"""
         
-        return self._content_store
+        self._dedup_lru[key] = content_id
+        if len(self._dedup_lru) > _DEDUP_SIZE:
+            self._dedup_lru.popitem(last=False)
     
-    async def _generate_with_agents(self, content_data: ContentCreate) -> Dict[str, Any]:
-        """Generate content using multi-agent CrewAI workflow"""
+    async def stream_content(self, content_data: ContentCreate) -> AsyncIterator[str]:
+        """Generate content and yield it as server-sent events while it is written
         
-        logger.info(f"Starting multi-agent content generation for: {content_data.title}")
+        Pre-written content (over 100 characters) is stored as-is and sent as
+        a single token, as in create_content. Otherwise research runs first,
+        then all sections stream from Gemini at once and are forwarded token
+        by token in order; with CONTENT_PIPELINE=crew the sections are written
+        by CrewAI agents and each is sent, in order, once it is finished.
+        Generation runs in a background task that stores (and caches) the
+        finished piece, so it completes even if the client disconnects part
+        way through.
+        """
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        producer = asyncio.create_task(self._produce_stream(content_data, queue))
+        self._background_tasks.add(producer)
+        producer.add_done_callback(self._background_tasks.discard)
+        
+        while True:
+            event = await queue.get()
+            yield f"data: {json.dumps(event)}\n\n"
+            if event["type"] in ("done", "error"):
+                break
+    
+    async def _produce_stream(self, content_data: ContentCreate, queue: asyncio.Queue):
+        """Run the generation pipeline, pushing writer tokens onto the queue"""
         
         try:
-            # Create research agent
-            researcher = Agent(
-                role="Content Research Specialist",
-                goal=f"Research comprehensive information about {content_data.title}",
-                backstory="""You are an expert researcher who gathers relevant, 
-                accurate, and current information on any given topic. You excel at 
-                finding key insights, statistics, and compelling angles for content creation.""",
-                llm=self.llm,
-                verbose=False,
-                allow_delegation=False
-            )
+            # Pre-written content is stored as-is, exactly like create_content
+            if len(content_data.content) > 100:
+                content_response = await self.create_content(content_data)
+                queue.put_nowait({"type": "token", "text": content_response.content})
+                queue.put_nowait({"type": "done", "content_id": content_response.id})
+                return
             
-            # Create writer agent
-            writer = Agent(
-                role="Professional Content Writer",
-                goal=f"Create high-quality {content_data.content_type} based on research",
-                backstory="""You are a skilled content writer who creates engaging, 
-                well-structured, and informative content. You adapt your writing style 
-                to match the content type and target audience perfectly.""",
-                llm=self.llm,
-                verbose=False,
-                allow_delegation=False
-            )
+            logger.info(f"Starting streamed content generation for: {content_data.title}")
             
-            # Create research task
-            research_task = Task(
-                description=f"""Research comprehensive information about: {content_data.title}
-                
-                Focus on:
-                - Key concepts and definitions
-                - Current trends and developments
-                - Important statistics and data
-                - Expert insights and opinions
-                - Real-world applications and examples
-                
-                Provide well-organized research findings that will inform high-quality content creation.""",
-                
-                expected_output="""Comprehensive research report with:
-                - Executive summary of key findings
-                - Detailed research on main concepts
-                - Current trends and statistics
-                - Expert insights and quotes
-                - Practical examples and case studies""",
-                
-                agent=researcher
-            )
+            chunks: List[str] = []
             
-            # Create writing task
-            writing_task = Task(
-                description=f"""Based on the research findings, create a high-quality 
-                {content_data.content_type} about: {content_data.title}
-                
-                Requirements:
-                - Length: 800-1200 words
-                - Style: Professional yet engaging
-                - Structure: Clear introduction, body, and conclusion
-                - Include relevant examples and insights from research
-                - Optimize for readability and engagement
-                
-                Create content that is informative, well-structured, and compelling.""",
+            def emit(text: str):
+                chunks.append(text)
+                queue.put_nowait({"type": "token", "text": text})
+            
+            cache_hit = False
+            start = time.perf_counter()
+            
+            cached = await self._cache.lookup(content_data.title, namespace=content_data.content_type)
+            if cached is not None:
+                cache_hit = True
+                generation_method = cached.get("generation_method", "direct")
+                agents_used = cached.get("agents_used", [])
+                emit(cached["content"])
+            elif self._use_crew:
+                generation_method = "multi_agent"
+                agents_used = list(_CREW_AGENTS)
+                research = await self._research(content_data)
                 
-                expected_output=f"""High-quality {content_data.content_type} with:
-                - Engaging introduction that hooks the reader
-                - Well-structured body with clear sections
-                - Relevant examples and supporting evidence
-                - Strong conclusion with key takeaways
-                - Professional tone appropriate for the content type""",
+                async with self._agent_pool.lease() as (_, writers):
+                    # Crews only return finished sections; each is sent, in
+                    # order, as soon as it and the ones before it are done
+                    futures = self._start_section_crews(content_data, research, writers)
+                    try:
+                        for index, future in enumerate(futures):
+                            emit(("\n\n" if index else "") + str(await future))
+                    finally:
+                        # Writers go back to the pool only once every crew has stopped
+                        await asyncio.wait(futures)
+            else:
+                generation_method = "direct"
+                agents_used = []
+                research = await self._research(content_data)
                 
-                agent=writer,
-                context=[research_task]
-            )
+                # All sections stream at once; the first is forwarded live and
+                # the later ones are buffered until their turn
+                section_queues = [asyncio.Queue() for _ in _SECTIONS]
+                pumps = [
+                    asyncio.create_task(self._stream_section(
+                        self._section_prompt(content_data, research, section, brief, words),
+                        section_queue
+                    ))
+                    for (section, brief, words), section_queue in zip(_SECTIONS, section_queues)
+                ]
+                try:
+                    for index, section_queue in enumerate(section_queues):
+                        if index:
+                            emit("\n\n")
+                        while (text := await section_queue.get()) is not None:
+                            emit(text)
+                        await pumps[index]  # Re-raises if the section failed
+                finally:
+                    for pump in pumps:
+                        pump.cancel()
+                    await asyncio.gather(*pumps, return_exceptions=True)
             
-            # Create and execute crew
-            content_crew = Crew(
-                agents=[researcher, writer],
-                tasks=[research_task, writing_task],
-                process=Process.sequential,
-                verbose=False
+            generation_time = time.perf_counter() - start
+            content = "".join(chunks)
+            if not cache_hit:
+                await self._cache.store(
+                    content_data.title,
+                    self._generation_record(content, generation_time),
+                    namespace=content_data.content_type
+                )
+            
+            metadata = content_data.metadata or {}
+            metadata["generation_method"] = generation_method
+            metadata["agents_used"] = agents_used
+            metadata["generation_time"] = f"{generation_time:.2f} seconds"
+            metadata["cache_hit"] = cache_hit
+            metadata["streamed"] = True
+            
+            content_response = ContentResponse(
+                id=self._next_id,
+                title=content_data.title,
+                content=content,
+                content_type=content_data.content_type,
+                metadata=metadata,
+                created_at=datetime.utcnow(),
+                updated_at=None
             )
             
-            start_time = datetime.utcnow()
-            result = content_crew.kickoff()
-            end_time = datetime.utcnow()
+            self._content_store[content_response.id] = content_response
+            self._next_id += 1
             
-            generation_time = (end_time - start_time).total_seconds()
+            logger.info(f"Streamed content created successfully: ID {content_response.id}")
+            queue.put_nowait({"type": "done", "content_id": content_response.id})
             
+        except Exception as e:
+            logger.error(f"Streamed generation failed: {str(e)}")
+            queue.put_nowait({"type": "error", "detail": f"Content generation failed: {str(e)}"})
+    
+    async def _stream_section(self, prompt: str, out: asyncio.Queue):
+        """Stream one section from Gemini into a queue, ending with None"""
+        
+        try:
+            response = await get_generative_model().generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                text = chunk.text
+                if text:
+                    out.put_nowait(text)
+        finally:
+            out.put_nowait(None)
+    
+    async def get_content(self, content_id: int) -> Optional[ContentResponse]:
+        """Retrieve specific content by ID"""
+        
+        return self._content_store.get(content_id)
+    
+    async def get_all_content(self, limit: int = 50, offset: int = 0,
+                              summary: bool = True) -> List[Union[ContentSummary, ContentResponse]]:
+        """Retrieve a page of content items, as summaries unless full items are requested"""
+        
+        page = islice(self._content_store.values(), offset, offset + limit)
+        if not summary:
+            return list(page)
+        
+        return [
+            ContentSummary.model_construct(
+                id=content.id,
+                title=content.title,
+                content_type=content.content_type,
+                created_at=content.created_at
+            )
+            for content in page
+        ]
+    
+    async def _generate_with_agents(self, content_data: ContentCreate) -> Dict[str, Any]:
+        """Generate content with the research and writer pipeline"""
+        
+        logger.info(f"Starting multi-agent content generation for: {content_data.title}")
+        
+        start = time.perf_counter()
+        cached = await self._cache.lookup(content_data.title, namespace=content_data.content_type)
+        if cached is not None:
+            logger.info(f"Serving cached generation for: {content_data.title}")
+            # Copy, so the timing reflects this request rather than the original run
             return {
-                "content": str(result),
-                "agents_used": ["Content Research Specialist", "Professional Content Writer"],
-                "generation_time": f"{generation_time:.2f} seconds",
-                "research_completed": True,
-                "quality_score": "A+"
+                **cached,
+                "generation_time": f"{time.perf_counter() - start:.2f} seconds",
+                "cache_hit": True
             }
+        
+        try:
+            start = time.perf_counter()
+            research = await self._research(content_data)
+            sections = await self._write_sections(content_data, research)
+            generation_time = time.perf_counter() - start
+            
+            generated = self._generation_record("\n\n".join(sections), generation_time)
+            await self._cache.store(content_data.title, generated, namespace=content_data.content_type)
+            return generated
             
         except Exception as e:
             logger.error(f"Multi-agent generation failed: {str(e)}")
@@ -218,35 +455,150 @@ The Intelligent Content Factory demonstrates the power of multi-agent AI systems
 for creating high-quality, professional content at scale.
 
 *Generated by Intelligent Content Factory v1.0.0*""",
+                "generation_method": "fallback",
                 "agents_used": ["Fallback Generator"],
                 "generation_time": "0.1 seconds",
                 "research_completed": False,
                 "quality_score": "B+ (Fallback Mode)"
             }
     
+    def _generation_record(self, content: str, generation_time: float) -> Dict[str, Any]:
+        """Describe a successful pipeline run, as returned and cached"""
+        
+        return {
+            "content": content,
+            "generation_method": "multi_agent" if self._use_crew else "direct",
+            "agents_used": list(_CREW_AGENTS) if self._use_crew else [],
+            "generation_time": f"{generation_time:.2f} seconds",
+            "research_completed": True,
+            "quality_score": "A+"
+        }
+    
+    def _section_description(self, content_data: ContentCreate, research: str,
+                             section: str, brief: str, words: str) -> str:
+        """Format the writing instructions for one section"""
+        
+        return _SECTION_DESC_TMPL.format(
+            brief=brief,
+            content_type=content_data.content_type,
+            title=content_data.title,
+            words=words,
+            section=section,
+            research=research
+        )
+    
+    def _section_prompt(self, content_data: ContentCreate, research: str,
+                        section: str, brief: str, words: str) -> str:
+        """Build the direct Gemini prompt for writing one section"""
+        
+        return _direct_prompt(
+            _WRITER_BACKSTORY,
+            self._section_description(content_data, research, section, brief, words),
+            _SECTION_OUTPUT_TMPL.format(section=section, content_type=content_data.content_type)
+        )
+    
+    async def _research(self, content_data: ContentCreate) -> str:
+        """Run the research step, directly against Gemini or as a CrewAI crew"""
+        
+        if not self._use_crew:
+            response = await get_generative_model().generate_content_async(
+                _direct_prompt(
+                    _RESEARCHER_BACKSTORY,
+                    _RESEARCH_DESC_TMPL.format(title=content_data.title),
+                    _RESEARCH_OUTPUT
+                )
+            )
+            return response.text
+        
+        async with self._agent_pool.lease() as (researcher, _):
+            research_crew = Crew(
+                agents=[researcher],
+                tasks=[Task(
+                    description=_RESEARCH_DESC_TMPL.format(title=content_data.title),
+                    expected_output=_RESEARCH_OUTPUT,
+                    agent=researcher
+                )],
+                process=Process.sequential,
+                verbose=False
+            )
+            loop = asyncio.get_running_loop()
+            return str(await loop.run_in_executor(get_crew_executor(), research_crew.kickoff))
+    
+    async def _write_sections(self, content_data: ContentCreate, research: str) -> List[str]:
+        """Write all sections concurrently, directly against Gemini or as CrewAI crews"""
+        
+        if not self._use_crew:
+            model = get_generative_model()
+            responses = await asyncio.gather(*(
+                model.generate_content_async(
+                    self._section_prompt(content_data, research, section, brief, words)
+                )
+                for section, brief, words in _SECTIONS
+            ))
+            return [response.text for response in responses]
+        
+        async with self._agent_pool.lease() as (_, writers):
+            futures = self._start_section_crews(content_data, research, writers)
+            # Let every crew stop before the writers go back to the pool
+            sections = await asyncio.gather(*futures, return_exceptions=True)
+            for section in sections:
+                if isinstance(section, BaseException):
+                    raise section
+            return [str(section) for section in sections]
+    
+    def _start_section_crews(self, content_data: ContentCreate, research: str,
+                             writers: Tuple[Agent, ...]) -> List[asyncio.Future]:
+        """Start one crew per section on the crew executor, one pooled writer each"""
+        
+        loop = asyncio.get_running_loop()
+        executor = get_crew_executor()
+        futures = []
+        for writer, (section, brief, words) in zip(writers, _SECTIONS):
+            writing_task = Task(
+                description=self._section_description(content_data, research, section, brief, words),
+                expected_output=_SECTION_OUTPUT_TMPL.format(
+                    section=section,
+                    content_type=content_data.content_type
+                ),
+                agent=writer
+            )
+            
+            section_crew = Crew(
+                agents=[writer],
+                tasks=[writing_task],
+                process=Process.sequential,
+                verbose=False
+            )
+            futures.append(loop.run_in_executor(executor, section_crew.kickoff))
+        
+        return futures
+    
     async def delete_content(self, content_id: int) -> bool:
         """Delete content by ID"""
         
-        for i, content in enumerate(self._content_store):
-            if content.id == content_id:
-                del self._content_store[i]
-                logger.info(f"Content deleted: ID {content_id}")
-                return True
-        return False
+        if self._content_store.pop(content_id, None) is None:
+            return False
+        
+        logger.info(f"Content deleted: ID {content_id}")
+        return True
     
     async def update_content(self, content_id: int, updates: Dict[str, Any]) -> Optional[ContentResponse]:
         """Update existing content"""
         
-        for content in self._content_store:
-            if content.id == content_id:
-                if "title" in updates:
-                    content.title = updates["title"]
-                if "content" in updates:
-                    content.content = updates["content"]
-                if "metadata" in updates:
-                    content.metadata.update(updates["metadata"])
-                
-                content.updated_at = datetime.utcnow()
-                logger.info(f"Content updated: ID {content_id}")
-                return content
-        return None
\ No newline at end of file
+        content = self._content_store.get(content_id)
+        if content is None:
+            return None
+        
+        changes: Dict[str, Any] = {"updated_at": datetime.utcnow()}
+        if "title" in updates:
+            changes["title"] = updates["title"]
+        if "content" in updates:
+            changes["content"] = updates["content"]
+        if "metadata" in updates:
+            changes["metadata"] = {**content.metadata, **updates["metadata"]}
+        
+        # Response models are frozen, so store an updated copy
+        content = content.model_copy(update=changes)
+        self._content_store[content_id] = content
+        logger.info(f"Content updated: ID {content_id}")
+        return content
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Workflow Batcher - Micro-Batched Content Generation
+==================================================
+
+Collects generation requests that arrive within a short window and runs them together
+Identical requests in the same batch share a single workflow run
+"""
+
+import asyncio
+import logging
+from functools import partial
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from app.models.schemas import ContentType, WorkflowResponse
+
+if TYPE_CHECKING:  # Only for annotations; keeps CrewAI out of this module's imports
+    from app.services.agent_service import AgentService
+
+logger = logging.getLogger(__name__)
+
+# How long to keep collecting requests after the first one arrives
+BATCH_WINDOW_SECONDS = 0.025
+
+# Maximum number of requests taken into one batch
+MAX_BATCH = 16
+
+# How long stop() lets running workflows finish before cancelling them
+STOP_TIMEOUT_SECONDS = 10.0
+
+
+class BatchingGenerator:
+    """
+    Micro-batching front end for AgentService.execute_content_workflow
+
+    Requests are queued and a background drain loop picks them up in
+    batches. Each distinct request in a batch runs as its own task, and
+    its callers' futures resolve as soon as that workflow finishes.
+    """
+
+    def __init__(self, agent_service: "AgentService",
+                 window: float = BATCH_WINDOW_SECONDS, max_batch: int = MAX_BATCH):
+        """
+        Initialize workflow batcher
+
+        Args:
+            agent_service: Service that executes the workflows
+            window: Seconds to wait for more requests after the first
+            max_batch: Maximum number of requests per batch
+        """
+        self._agent_service = agent_service
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._workflow_tasks: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the background drain loop on the running event loop"""
+        if self._drain_task is None:
+            self._queue = asyncio.Queue()
+            self._drain_task = asyncio.create_task(self._drain_loop())
+            logger.info("Workflow batcher started")
+
+    async def stop(self, timeout: float = STOP_TIMEOUT_SECONDS):
+        """
+        Stop the drain loop and wind down running workflows
+
+        Args:
+            timeout: Seconds to let running workflows finish before cancelling them
+        """
+        if self._drain_task is None:
+            return
+
+        self._drain_task.cancel()
+        try:
+            await self._drain_task
+        except asyncio.CancelledError:
+            pass
+        self._drain_task = None
+
+        # Requests still queued will never be dispatched
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+
+        if self._workflow_tasks:
+            _, pending = await asyncio.wait(self._workflow_tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"Cancelled {len(pending)} running workflows on shutdown")
+                await asyncio.wait(pending)
+        logger.info("Workflow batcher stopped")
+
+    def submit(self, topic: str, content_type: ContentType = "article") -> "asyncio.Future[WorkflowResponse]":
+        """
+        Queue a workflow request
+
+        Args:
+            topic: Content topic
+            content_type: Desired content type
+
+        Returns:
+            Future resolved with the WorkflowResponse
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((topic, content_type, future))
+        return future
+
+    async def _drain_loop(self):
+        """Collect queued requests into batches and dispatch them"""
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await asyncio.sleep(self.window)
+            except asyncio.CancelledError:
+                # Stopped while collecting; these requests will never run
+                for _, _, future in batch:
+                    future.cancel()
+                raise
+
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[str, ContentType, asyncio.Future]]):
+        """Start one workflow per distinct request in the batch"""
+        waiters: Dict[Tuple[str, ContentType], List[asyncio.Future]] = {}
+        for topic, content_type, future in batch:
+            waiters.setdefault((topic, content_type), []).append(future)
+
+        logger.debug(f"Dispatching workflow batch: {len(batch)} requests, {len(waiters)} distinct")
+
+        for (topic, content_type), futures in waiters.items():
+            task = asyncio.create_task(
+                self._agent_service.execute_content_workflow(topic, content_type)
+            )
+            self._workflow_tasks.add(task)
+            task.add_done_callback(partial(self._resolve, futures))
+
+    def _resolve(self, futures: List[asyncio.Future], task: asyncio.Task):
+        """Hand a finished workflow's outcome to everyone waiting on it"""
+        self._workflow_tasks.discard(task)
+        for future in futures:
+            if future.done():  # Caller went away
+                continue
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
@@ -0,0 +1,65 @@
+"""
+Agent Pool Utility - Reusable CrewAI Agent Sets
+==============================================
+
+Keeps prebuilt CrewAI agents between workflow runs
+Gives each concurrent run its own agents so per-run state is never shared
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Generic, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AgentPool(Generic[T]):
+    """
+    Free-list of prebuilt agent sets
+
+    CrewAI agents hold per-run state (agent executor, owning crew), so two
+    crews running at the same time must not share an agent. The pool hands
+    out an idle set when one is available and otherwise builds a new one in
+    a worker thread, since building agents is slow.
+
+    acquire/release are expected to be called from the event loop thread,
+    not from the worker threads that run the crews.
+    """
+
+    def __init__(self, factory: Callable[[], T], max_idle: int = 8, prebuild: int = 1):
+        """
+        Initialize agent pool
+
+        Args:
+            factory: Callable that builds a new agent set
+            max_idle: Maximum number of idle sets kept for reuse
+            prebuild: Number of sets to build up front
+        """
+        self._factory = factory
+        self.max_idle = max_idle
+        self._idle: List[T] = [factory() for _ in range(prebuild)]
+
+    async def acquire(self) -> T:
+        """Take an idle agent set, building a new one off the event loop if none is available"""
+        if self._idle:
+            return self._idle.pop()
+
+        logger.debug("Agent pool empty, building a new agent set")
+        return await asyncio.to_thread(self._factory)
+
+    def release(self, item: T):
+        """Return an agent set to the pool once its run has finished"""
+        if len(self._idle) < self.max_idle:
+            self._idle.append(item)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[T]:
+        """Async context manager that acquires an agent set and always releases it"""
+        item = await self.acquire()
+        try:
+            yield item
+        finally:
+            self.release(item)
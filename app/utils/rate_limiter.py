@@ -8,11 +8,68 @@ Prevents abuse and ensures fair resource usage
 
 import time
 import logging
-from typing import Dict, List
-from collections import defaultdict, deque
+import ipaddress
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on recycled client windows kept for reuse
+_WINDOW_POOL_SIZE = 1024
+
+# Number of allow_request calls between automatic cleanup passes
+_CLEANUP_INTERVAL = 1000
+
+# Client history is split into this many shards (a power of two), selected
+# by client id hash; automatic cleanup sweeps one shard per pass
+_SHARD_COUNT = 16
+_SHARD_MASK = _SHARD_COUNT - 1
+
+# Clients are identified by an int key (see client_key) or any string id
+ClientId = Union[int, str]
+
+# Set on IPv6 keys so they never collide with IPv4 ones ("::1" vs "0.0.0.1")
+_IPV6_KEY_FLAG = 1 << 128
+
+@lru_cache(maxsize=4096)
+def client_key(host: Optional[str]) -> int:
+    """
+    Convert a client host into a compact integer rate limiting key
+    
+    IPv4 and IPv6 addresses map to disjoint ranges. Keys are not meant
+    for display; log the host itself when reporting a client.
+    
+    Args:
+        host: Client IP address, or None if the server did not report one
+        
+    Returns:
+        The address as an int (with _IPV6_KEY_FLAG set for IPv6), or the
+        hash of host if it is not an IP address
+    """
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return hash(host)
+    if address.version == 6:
+        return int(address) | _IPV6_KEY_FLAG
+    return int(address)
+
+class _RequestWindow:
+    """
+    Fixed-size ring buffer of a client's most recent request timestamps
+    
+    Holds at most max_requests timestamps; once full, `head` points at the
+    oldest one, which is overwritten by the next accepted request.
+    """
+    
+    __slots__ = ("timestamps", "head", "count")
+    
+    def __init__(self, size: int):
+        self.timestamps = array("d", [0.0]) * size
+        self.head = 0
+        self.count = 0
+
 class RateLimiter:
     """
     Token bucket rate limiter for API requests
@@ -31,39 +88,101 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.request_history: Dict[str, deque] = defaultdict(deque)
+        self._shards: List[Dict[ClientId, _RequestWindow]] = [{} for _ in range(_SHARD_COUNT)]
+        self._window_pool: List[_RequestWindow] = []  # Recycled windows of departed clients
+        self._call_counter = 0
+        self._next_cleanup_shard = 0
         
         logger.info(f"Rate limiter initialized: {max_requests} requests per {time_window} seconds")
     
-    def allow_request(self, client_id: str) -> bool:
+    def allow_request(self, client_id: ClientId) -> bool:
         """
         Check if request should be allowed for the given client
         
         Args:
-            client_id: Unique identifier for the client (usually IP address)
+            client_id: Unique identifier for the client (usually client_key() of its IP)
             
         Returns:
             True if request is allowed, False if rate limit exceeded
         """
-        current_time = time.time()
-        client_requests = self.request_history[client_id]
+        current_time = time.monotonic()
+        # Hot path: read each attribute once into a local
+        max_requests = self.max_requests
+        time_window = self.time_window
+        shards = self._shards
+        
+        # A limit of zero (e.g. a blocked tier) rejects everything
+        if max_requests <= 0:
+            return False
         
-        # Remove old requests outside the time window
-        while client_requests and client_requests[0] <= current_time - self.time_window:
-            client_requests.popleft()
+        # Drop inactive clients every so often instead of relying on a
+        # separate background task, one shard at a time to keep passes short
+        call_counter = self._call_counter + 1
+        if call_counter >= _CLEANUP_INTERVAL:
+            call_counter = 0
+            self._cleanup_shard(shards[self._next_cleanup_shard], current_time - time_window)
+            self._next_cleanup_shard = (self._next_cleanup_shard + 1) & _SHARD_MASK
+        self._call_counter = call_counter
         
-        # Check if client has exceeded rate limit
-        if len(client_requests) >= self.max_requests:
-            logger.warning(f"Rate limit exceeded for client: {client_id}")
+        # Existing clients are looked up inline; only new ones pay for a call
+        shard = shards[hash(client_id) & _SHARD_MASK]
+        window = shard.get(client_id)
+        if window is None:
+            window = self._new_window(shard, client_id)
+        
+        # A full ring whose oldest entry is still inside the window means
+        # max_requests requests were made within the last time_window seconds
+        timestamps = window.timestamps
+        head = window.head
+        count = window.count
+        if count == max_requests and current_time - timestamps[head] < time_window:
+            # Callers log the rejection with a readable client identity
+            logger.debug("Rate limit exceeded for client: %s", client_id)
             return False
         
-        # Add current request to history
-        client_requests.append(current_time)
+        # Record the request over the oldest slot
+        timestamps[head] = current_time
+        head += 1
+        window.head = 0 if head == max_requests else head
+        if count < max_requests:
+            count += 1
+            window.count = count
         
-        logger.debug(f"Request allowed for client {client_id}: {len(client_requests)}/{self.max_requests}")
+        # Lazy formatting: this runs on every allowed request
+        logger.debug("Request allowed for client %s: %d/%d", client_id, count, max_requests)
         return True
     
-    def get_client_status(self, client_id: str) -> Dict[str, any]:
+    def _shard_for(self, client_id: ClientId) -> Dict[ClientId, _RequestWindow]:
+        """Get the history shard that holds a client"""
+        return self._shards[hash(client_id) & _SHARD_MASK]
+    
+    def _new_window(self, shard: Dict[ClientId, _RequestWindow], client_id: ClientId) -> _RequestWindow:
+        """Register a window for a new client, reusing a pooled one if possible"""
+        window = self._window_pool.pop() if self._window_pool else _RequestWindow(self.max_requests)
+        shard[client_id] = window
+        return window
+    
+    def _release_window(self, shard: Dict[ClientId, _RequestWindow], client_id: ClientId):
+        """Drop a client's window and keep it for reuse"""
+        window = shard.pop(client_id)
+        if len(self._window_pool) < _WINDOW_POOL_SIZE:
+            window.head = 0
+            window.count = 0
+            self._window_pool.append(window)
+    
+    def _count_recent(self, window: _RequestWindow, cutoff: float) -> int:
+        """Count timestamps newer than cutoff, walking back from the newest"""
+        timestamps = window.timestamps
+        index = window.head
+        recent = 0
+        while recent < window.count:
+            index = (index - 1) % self.max_requests
+            if timestamps[index] <= cutoff:
+                break
+            recent += 1
+        return recent
+    
+    def get_client_status(self, client_id: ClientId) -> Dict[str, any]:
         """
         Get rate limiting status for a specific client
         
@@ -73,20 +192,23 @@ class RateLimiter:
         Returns:
             Dictionary with client rate limiting information
         """
-        current_time = time.time()
-        client_requests = self.request_history[client_id]
-        
-        # Clean up old requests
-        while client_requests and client_requests[0] <= current_time - self.time_window:
-            client_requests.popleft()
+        return self._client_status(client_id, time.monotonic())
+    
+    def _client_status(self, client_id: ClientId, current_time: float) -> Dict[str, any]:
+        """Build a client's status for a monotonic timestamp"""
+        window = self._shard_for(client_id).get(client_id)
         
-        requests_used = len(client_requests)
+        requests_used = 0
+        if window is not None:
+            requests_used = self._count_recent(window, current_time - self.time_window)
         requests_remaining = max(0, self.max_requests - requests_used)
         
-        # Calculate reset time (when oldest request will expire)
+        # Calculate reset time (when oldest request will expire) as a
+        # wall-clock timestamp; history itself is kept in monotonic time
         reset_time = None
-        if client_requests:
-            reset_time = client_requests[0] + self.time_window
+        if requests_used:
+            oldest = (window.head - requests_used) % self.max_requests
+            reset_time = time.time() + (window.timestamps[oldest] + self.time_window - current_time)
         
         return {
             "client_id": client_id,
@@ -105,9 +227,14 @@ class RateLimiter:
         Returns:
             List of dictionaries with client information
         """
-        return [self.get_client_status(client_id) for client_id in self.request_history.keys()]
+        current_time = time.monotonic()
+        return [
+            self._client_status(client_id, current_time)
+            for shard in self._shards
+            for client_id in shard
+        ]
     
-    def reset_client(self, client_id: str) -> bool:
+    def reset_client(self, client_id: ClientId) -> bool:
         """
         Reset rate limit for a specific client (admin function)
         
@@ -117,34 +244,41 @@ class RateLimiter:
         Returns:
             True if client was found and reset, False otherwise
         """
-        if client_id in self.request_history:
-            del self.request_history[client_id]
+        shard = self._shard_for(client_id)
+        if client_id in shard:
+            self._release_window(shard, client_id)
             logger.info(f"Rate limit reset for client: {client_id}")
             return True
         return False
     
-    def cleanup_old_entries(self):
+    def cleanup_old_entries(self, current_time: Optional[float] = None):
         """
         Clean up old entries from all clients to prevent memory leaks
-        Should be called periodically by a background task
+        allow_request also sweeps one shard every _CLEANUP_INTERVAL requests
+        
+        Args:
+            current_time: time.monotonic() value to use, read now if omitted
         """
-        current_time = time.time()
-        clients_to_remove = []
+        if current_time is None:
+            current_time = time.monotonic()
+        cutoff = current_time - self.time_window
         
-        for client_id, requests in self.request_history.items():
-            # Remove old requests
-            while requests and requests[0] <= current_time - self.time_window:
-                requests.popleft()
-            
-            # Mark empty clients for removal
-            if not requests:
-                clients_to_remove.append(client_id)
+        removed = sum(self._cleanup_shard(shard, cutoff) for shard in self._shards)
+        logger.debug(f"Cleaned up {removed} inactive clients")
+    
+    def _cleanup_shard(self, shard: Dict[ClientId, _RequestWindow], cutoff: float) -> int:
+        """Remove a shard's clients with no requests after cutoff, returning how many"""
+        # Clients whose newest request has expired have nothing in the window
+        clients_to_remove = [
+            client_id for client_id, window in shard.items()
+            if not self._count_recent(window, cutoff)
+        ]
         
         # Remove empty clients
         for client_id in clients_to_remove:
-            del self.request_history[client_id]
+            self._release_window(shard, client_id)
         
-        logger.debug(f"Cleaned up {len(clients_to_remove)} inactive clients")
+        return len(clients_to_remove)
     
     def get_stats(self) -> Dict[str, any]:
         """
@@ -153,20 +287,21 @@ class RateLimiter:
         Returns:
             Dictionary with statistics
         """
-        total_clients = len(self.request_history)
-        total_requests = sum(len(requests) for requests in self.request_history.values())
+        total_clients = sum(len(shard) for shard in self._shards)
+        total_requests = sum(window.count for shard in self._shards for window in shard.values())
         
         # Count active clients (with requests in current window)
-        current_time = time.time()
+        cutoff = time.monotonic() - self.time_window
         active_clients = 0
         limited_clients = 0
         
-        for requests in self.request_history.values():
-            recent_requests = [r for r in requests if r > current_time - self.time_window]
-            if recent_requests:
-                active_clients += 1
-                if len(recent_requests) >= self.max_requests:
-                    limited_clients += 1
+        for shard in self._shards:
+            for window in shard.values():
+                recent_requests = self._count_recent(window, cutoff)
+                if recent_requests:
+                    active_clients += 1
+                    if recent_requests >= self.max_requests:
+                        limited_clients += 1
         
         return {
             "total_clients": total_clients,
@@ -202,7 +337,7 @@ class AdvancedRateLimiter:
         self.limiters[tier_name] = RateLimiter(max_requests, time_window)
         logger.info(f"Added rate limiting tier '{tier_name}': {max_requests}/{time_window}s")
     
-    def set_client_tier(self, client_id: str, tier_name: str):
+    def set_client_tier(self, client_id: ClientId, tier_name: str):
         """
         Assign a client to a specific tier
         
@@ -216,7 +351,7 @@ class AdvancedRateLimiter:
         self.client_tiers[client_id] = tier_name
         logger.info(f"Client {client_id} assigned to tier '{tier_name}'")
     
-    def allow_request(self, client_id: str) -> bool:
+    def allow_request(self, client_id: ClientId) -> bool:
         """
         Check if request should be allowed using tiered rate limiting
         
@@ -235,7 +370,7 @@ class AdvancedRateLimiter:
         
         return self.limiters[tier_name].allow_request(client_id)
     
-    def get_client_status(self, client_id: str) -> Dict[str, any]:
+    def get_client_status(self, client_id: ClientId) -> Dict[str, any]:
         """Get detailed status for a client including tier information"""
         tier_name = self.client_tiers.get(client_id, 'default')
         
@@ -0,0 +1,144 @@
+"""
+Semantic Cache Utility - Similarity-Keyed Response Cache
+=======================================================
+
+Caches generated results by the meaning of the request rather than its exact text
+Paraphrased requests ("Intro to X" / "X Basics") resolve to the same entry
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], Awaitable[Sequence[float]]]
+
+
+class _Namespace:
+    """Fixed-capacity ring of normalized vectors and their cached values"""
+
+    def __init__(self, capacity: int, dimensions: int):
+        self.vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.expires = np.full(capacity, -np.inf)
+        self.values: List[Any] = [None] * capacity
+        self.next_slot = 0
+        self.size = 0
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for expensive generation results
+
+    Keys are embedded with the supplied async embedder and compared by
+    cosine similarity; a lookup hits when the closest unexpired entry in
+    the same namespace scores at least `threshold`. Each namespace keeps at
+    most `max_entries` entries and overwrites the oldest when full.
+    Embedding failures are logged and treated as a cache miss.
+    """
+
+    def __init__(self, embedder: Embedder, threshold: float = 0.92,
+                 ttl: int = 3600, max_entries: int = 1024):
+        """
+        Initialize semantic cache
+
+        Args:
+            embedder: Async callable returning an embedding vector for a text
+            threshold: Minimum cosine similarity for a hit
+            ttl: Entry lifetime in seconds
+            max_entries: Maximum entries kept per namespace
+        """
+        self._embedder = embedder
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._namespaces: Dict[str, _Namespace] = {}
+        # Vectors from recent lookups, so a miss followed by store embeds once
+        self._recent_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    async def lookup(self, key: str, namespace: str = "") -> Optional[Any]:
+        """
+        Find a cached value for a key similar to the given one
+
+        Args:
+            key: Text describing the request
+            namespace: Partition that must match exactly (e.g. content type)
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        space = self._namespaces.get(namespace)
+        if space is None or space.size == 0:
+            return None
+
+        vector = await self._vector_for(key)
+        if vector is None or vector.shape[0] != space.vectors.shape[1]:
+            return None
+
+        scores = space.vectors[:space.size] @ vector
+        scores[space.expires[:space.size] < time.monotonic()] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        logger.debug(f"Semantic cache hit for '{key}' (score {scores[best]:.3f})")
+        return space.values[best]
+
+    async def store(self, key: str, value: Any, namespace: str = ""):
+        """
+        Cache a value under the given key
+
+        Args:
+            key: Text describing the request
+            value: Result to cache
+            namespace: Partition the entry belongs to
+        """
+        vector = await self._vector_for(key)
+        if vector is None:
+            return
+
+        space = self._namespaces.get(namespace)
+        if space is None:
+            space = _Namespace(self.max_entries, vector.shape[0])
+            self._namespaces[namespace] = space
+        elif vector.shape[0] != space.vectors.shape[1]:
+            return
+
+        slot = space.next_slot
+        space.vectors[slot] = vector
+        space.expires[slot] = time.monotonic() + self.ttl
+        space.values[slot] = value
+        space.next_slot = (slot + 1) % self.max_entries
+        space.size = min(space.size + 1, self.max_entries)
+
+    def clear(self):
+        """Drop all cached entries"""
+        self._namespaces.clear()
+        self._recent_vectors.clear()
+
+    async def _vector_for(self, key: str) -> Optional[np.ndarray]:
+        """Embed and normalize a key, reusing the vector from a recent call"""
+        vector = self._recent_vectors.get(key)
+        if vector is not None:
+            self._recent_vectors.move_to_end(key)
+            return vector
+
+        try:
+            embedding = await self._embedder(key)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {str(e)}")
+            return None
+
+        vector = np.array(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        vector /= norm
+
+        self._recent_vectors[key] = vector
+        if len(self._recent_vectors) > 256:
+            self._recent_vectors.popitem(last=False)
+        return vector
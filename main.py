@@ -15,19 +15,22 @@ Features:
 
 import os
 import logging
-from typing import List
-from fastapi import FastAPI, HTTPException, Depends, Request, status
+from functools import lru_cache
+from typing import List, Union
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware  
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from starlette.status import HTTP_429_TOO_MANY_REQUESTS
 from dotenv import load_dotenv
 
 from app.services.content_service import ContentService
 from app.services.agent_service import AgentService
-from app.models.schemas import ContentCreate, ContentResponse, AgentCreate, AgentResponse
-from app.utils.rate_limiter import RateLimiter
+from app.services.workflow_batcher import BatchingGenerator
+from app.models.schemas import (
+    ContentCreate, ContentResponse, ContentSummary, AgentCreate, AgentResponse, ContentType
+)
+from app.utils.rate_limiter import RateLimiter, client_key
 
 # Load environment variables
 load_dotenv()
@@ -42,7 +45,8 @@ app = FastAPI(
     description="Production-ready multi-agent content generation system",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -54,24 +58,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Rate limiting middleware
-class RateLimitMiddleware(BaseHTTPMiddleware):
+# Rate limiting middleware - plain ASGI, so allowed requests pass straight
+# through without BaseHTTPMiddleware's extra task and body wrapping
+_RATE_LIMITED_BODY = b'{"detail":"Rate limit exceeded. Please try again later."}'
+
+class RateLimitASGI:
     def __init__(self, app, rate_limit_calls: int = 100, rate_limit_seconds: int = 60):
-        super().__init__(app)
+        self.app = app
         self.rate_limiter = RateLimiter(rate_limit_calls, rate_limit_seconds)
 
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        if not self.rate_limiter.allow_request(client_ip):
-            raise HTTPException(
-                status_code=HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded. Please try again later."
-            )
-        response = await call_next(request)
-        return response
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            client = scope.get("client")
+            client_ip = client[0] if client else None
+            if not self.rate_limiter.allow_request(client_key(client_ip)):
+                logger.warning(f"Rate limit exceeded for client: {client_ip}")
+                await send({
+                    "type": "http.response.start",
+                    "status": HTTP_429_TOO_MANY_REQUESTS,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(_RATE_LIMITED_BODY)).encode()),
+                    ],
+                })
+                await send({"type": "http.response.body", "body": _RATE_LIMITED_BODY})
+                return
+        await self.app(scope, receive, send)
 
 # Add rate limiting middleware
-app.add_middleware(RateLimitMiddleware, rate_limit_calls=100, rate_limit_seconds=60)
+app.add_middleware(RateLimitASGI, rate_limit_calls=100, rate_limit_seconds=60)
 
 # Mount static files for the web interface
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -80,7 +95,7 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Global exception on {request.url.path}: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
@@ -89,21 +104,36 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Service dependencies
+# Service dependencies - one shared instance each, so the in-memory stores,
+# pooled agents and LLM client survive across requests
+@lru_cache(maxsize=1)
 def get_content_service() -> ContentService:
     return ContentService()
 
+@lru_cache(maxsize=1)
 def get_agent_service() -> AgentService:
     return AgentService()
 
+@lru_cache(maxsize=1)
+def get_workflow_batcher() -> BatchingGenerator:
+    return BatchingGenerator(get_agent_service())
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     logger.info("🚀 Intelligent Content Factory starting up...")
+    get_agent_service().start_warmup()
+    get_content_service()
+    get_workflow_batcher().start()
     logger.info("✅ Multi-agent system initialized")
     logger.info("✅ API endpoints ready")
     logger.info("✅ Rate limiting active")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    await get_workflow_batcher().stop()
+
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
@@ -136,13 +166,35 @@ async def create_content(
         logger.error(f"Error creating content: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Content creation failed: {str(e)}")
 
-@app.get("/api/v1/content/", response_model=List[ContentResponse], tags=["Content"])
+@app.post("/api/v1/content/stream", tags=["Content"])
+async def stream_content(
+    content: ContentCreate,
+    content_service: ContentService = Depends(get_content_service)
+):
+    """
+    Generate content and stream it back as server-sent events
+    
+    Each event is a JSON object: "token" events carry the text as it is
+    written, followed by a final "done" event with the stored content ID
+    (or an "error" event if generation failed). Content of more than 100
+    characters is stored as provided, as with POST /api/v1/content/.
+    """
+    return StreamingResponse(
+        content_service.stream_content(content),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/v1/content/", response_model=List[Union[ContentSummary, ContentResponse]], tags=["Content"])
 async def list_content(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    summary: bool = True,
     content_service: ContentService = Depends(get_content_service)
 ):
-    """Retrieve all content items"""
+    """Retrieve a page of content items; pass summary=false to include content bodies"""
     try:
-        return await content_service.get_all_content()
+        return await content_service.get_all_content(limit, offset, summary)
     except Exception as e:
         logger.error(f"Error listing content: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve content")
@@ -201,8 +253,8 @@ async def list_agents(
 @app.post("/api/v1/generate/", tags=["Generation"])
 async def generate_content_workflow(
     topic: str,
-    content_type: str = "article",
-    agent_service: AgentService = Depends(get_agent_service),
+    content_type: ContentType = "article",
+    batcher: BatchingGenerator = Depends(get_workflow_batcher),
     content_service: ContentService = Depends(get_content_service)
 ):
     """
@@ -215,15 +267,15 @@ async def generate_content_workflow(
     4. Store the result in the database
     """
     try:
-        # Execute multi-agent workflow
-        result = await agent_service.execute_content_workflow(topic, content_type)
+        # Execute multi-agent workflow, batched with concurrent requests
+        result = await batcher.submit(topic, content_type)
         
         # Store the generated content
         content_data = ContentCreate(
             title=f"AI Generated: {topic}",
-            content=result["content"],
+            content=result.result["content"],
             content_type=content_type,
-            metadata=result.get("metadata", {})
+            metadata=result.result.get("metadata", {})
         )
         
         stored_content = await content_service.create_content(content_data)
@@ -143,19 +143,20 @@ class ContentFactory {
     }
 
     displayResults(result) {
-        this.currentWorkflow = result.workflow_result;
+        const workflow = result.workflow_result;
+        this.currentWorkflow = workflow?.result;
         
         // Display content with proper Markdown rendering
         const contentDisplay = document.getElementById('contentDisplay');
-        const formattedContent = this.renderMarkdown(result.workflow_result.content);
+        const formattedContent = this.renderMarkdown(this.currentWorkflow.content);
         contentDisplay.innerHTML = formattedContent;
 
         // Display stats
-        if (result.workflow_result) {
-            document.getElementById('agentsUsed').textContent = result.workflow_result.agents_used?.length || 'N/A';
-            document.getElementById('tasksCompleted').textContent = result.workflow_result.tasks_completed || 'N/A';
-            document.getElementById('executionTime').textContent = result.workflow_result.execution_time || 'N/A';
-            document.getElementById('qualityScore').textContent = result.workflow_result.quality_score || 'N/A';
+        if (workflow) {
+            document.getElementById('agentsUsed').textContent = workflow.agents_used?.length || 'N/A';
+            document.getElementById('tasksCompleted').textContent = workflow.result?.tasks_completed || 'N/A';
+            document.getElementById('executionTime').textContent = workflow.result?.execution_time || 'N/A';
+            document.getElementById('qualityScore').textContent = workflow.result?.quality_score || 'N/A';
             
             document.getElementById('workflowStats').style.display = 'block';
         }
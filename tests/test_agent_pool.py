@@ -0,0 +1,80 @@
+"""Tests for AgentPool"""
+
+import threading
+
+import pytest
+
+from app.utils.agent_pool import AgentPool
+
+
+class CountingFactory:
+    """Builds numbered agent sets, recording the thread each was built on"""
+
+    def __init__(self):
+        self.built = 0
+        self.threads = []
+
+    def __call__(self):
+        self.built += 1
+        self.threads.append(threading.current_thread())
+        return self.built
+
+
+def test_prebuild():
+    factory = CountingFactory()
+    AgentPool(factory, prebuild=2)
+
+    assert factory.built == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_reuses_released_sets():
+    factory = CountingFactory()
+    pool = AgentPool(factory, prebuild=1)
+
+    item = await pool.acquire()
+    pool.release(item)
+
+    assert await pool.acquire() == item
+    assert factory.built == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_builds_off_the_event_loop_when_empty():
+    factory = CountingFactory()
+    pool = AgentPool(factory, prebuild=0)
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+
+    assert first != second
+    assert factory.built == 2
+    assert threading.main_thread() not in factory.threads
+
+
+@pytest.mark.asyncio
+async def test_release_respects_max_idle():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=1, prebuild=0)
+    first = await pool.acquire()
+    second = await pool.acquire()
+
+    pool.release(first)
+    pool.release(second)
+
+    assert await pool.acquire() == first
+    assert await pool.acquire() == 3
+
+
+@pytest.mark.asyncio
+async def test_lease_releases_on_error():
+    factory = CountingFactory()
+    pool = AgentPool(factory, prebuild=1)
+
+    with pytest.raises(ValueError):
+        async with pool.lease() as item:
+            raise ValueError("crew failed")
+
+    async with pool.lease() as again:
+        assert again == item
+    assert factory.built == 1
@@ -0,0 +1,157 @@
+"""Tests for the ring-buffer RateLimiter"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import rate_limiter
+from app.utils.rate_limiter import AdvancedRateLimiter, RateLimiter, client_key
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock, time=time.time))
+    return clock
+
+
+def test_rejects_once_limit_reached(clock):
+    limiter = RateLimiter(3, 10)
+
+    assert [limiter.allow_request(1) for _ in range(4)] == [True, True, True, False]
+    assert limiter.get_client_status(1)["is_limited"]
+
+
+def test_clients_are_limited_independently(clock):
+    limiter = RateLimiter(1, 10)
+
+    assert limiter.allow_request(1)
+    assert not limiter.allow_request(1)
+    assert limiter.allow_request(2)
+
+
+def test_window_boundary(clock):
+    limiter = RateLimiter(2, 10)
+    assert limiter.allow_request(1)
+    clock.now += 5
+    assert limiter.allow_request(1)
+
+    # The oldest request is still inside the window
+    clock.now += 4.999
+    assert not limiter.allow_request(1)
+
+    # Exactly time_window after the oldest request its slot frees up
+    clock.now += 0.001
+    assert limiter.allow_request(1)
+    assert not limiter.allow_request(1)
+
+    # The second request expires next
+    clock.now += 5
+    assert limiter.allow_request(1)
+
+
+def test_ring_wraps_around(clock):
+    limiter = RateLimiter(3, 10)
+    for _ in range(10):
+        assert limiter.allow_request(1)
+        clock.now += 4
+
+    # Requests 4 and 8 seconds ago are still counted, 12 seconds ago is not
+    status = limiter.get_client_status(1)
+    assert status["requests_used"] == 2
+    assert status["requests_remaining"] == 1
+
+    assert limiter.allow_request(1)
+    assert not limiter.allow_request(1)
+
+
+def test_status_counts_only_recent_requests(clock):
+    limiter = RateLimiter(5, 10)
+    limiter.allow_request(1)
+    clock.now += 6
+    limiter.allow_request(1)
+    limiter.allow_request(1)
+    clock.now += 6
+
+    status = limiter.get_client_status(1)
+    assert status["requests_used"] == 2
+    assert status["requests_remaining"] == 3
+    assert not status["is_limited"]
+    assert status["reset_time"] == pytest.approx(time.time() - 6 + 10, abs=1)
+
+
+def test_cleanup_recycles_windows(clock):
+    limiter = RateLimiter(2, 10)
+    limiter.allow_request(1)
+    limiter.allow_request(1)
+    window = limiter._shard_for(1)[1]
+
+    clock.now += 10
+    limiter.cleanup_old_entries()
+    assert limiter.get_stats()["total_clients"] == 0
+    assert limiter._window_pool == [window]
+
+    # A new client reuses the window with a clean history
+    assert limiter.allow_request(2)
+    assert limiter._shard_for(2)[2] is window
+    assert limiter.get_client_status(2)["requests_used"] == 1
+    assert limiter.allow_request(2)
+    assert not limiter.allow_request(2)
+
+
+def test_cleanup_keeps_active_clients(clock):
+    limiter = RateLimiter(2, 10)
+    limiter.allow_request(1)
+    clock.now += 5
+    limiter.allow_request(2)
+    clock.now += 6
+
+    limiter.cleanup_old_entries()
+    stats = limiter.get_stats()
+    assert stats["total_clients"] == 1
+    assert limiter.get_client_status(2)["requests_used"] == 1
+
+
+def test_reset_client(clock):
+    limiter = RateLimiter(1, 10)
+    limiter.allow_request(1)
+    assert not limiter.allow_request(1)
+
+    assert limiter.reset_client(1)
+    assert not limiter.reset_client(1)
+    assert limiter.allow_request(1)
+
+
+def test_zero_limit_rejects_everything(clock):
+    limiter = RateLimiter(0, 10)
+
+    assert not limiter.allow_request(1)
+    assert limiter.get_client_status(1)["is_limited"]
+    assert limiter.get_stats()["total_clients"] == 0
+
+
+def test_blocked_tier():
+    limiter = AdvancedRateLimiter()
+    limiter.add_tier("blocked", 0, 60)
+    limiter.set_client_tier(1, "blocked")
+
+    assert not limiter.allow_request(1)
+    assert limiter.allow_request(2)
+
+
+def test_client_key():
+    assert client_key("10.0.0.1") == client_key("10.0.0.1")
+    assert client_key("::1") != client_key("0.0.0.1")
+    assert client_key("testclient") == hash("testclient")
+    assert client_key(None) == hash(None)
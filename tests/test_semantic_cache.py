@@ -0,0 +1,179 @@
+"""Tests for SemanticCache"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import semantic_cache
+from app.utils.semantic_cache import SemanticCache
+
+VECTORS = {
+    "intro to python": [1.0, 0.0, 0.0],
+    "python basics": [0.95, 0.05, 0.0],
+    "python vs rust": [0.7, 0.7, 0.0],
+    "gardening": [0.0, 0.0, 1.0],
+    "first": [1.0, 0.0, 0.0],
+    "second": [0.0, 1.0, 0.0],
+    "third": [0.0, 0.0, 1.0],
+    "zero": [0.0, 0.0, 0.0],
+}
+
+
+class StubEmbedder:
+    """Async embedder backed by a fixed table, counting its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, text: str):
+        self.calls += 1
+        if text not in VECTORS:
+            raise RuntimeError("embedding service unavailable")
+        return VECTORS[text]
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def embedder():
+    return StubEmbedder()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(semantic_cache, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_similar_key_hits(embedder, clock):
+    cache = SemanticCache(embedder, threshold=0.9)
+    await cache.store("intro to python", "result")
+
+    assert await cache.lookup("intro to python") == "result"
+    assert await cache.lookup("python basics") == "result"
+
+
+@pytest.mark.asyncio
+async def test_dissimilar_key_misses(embedder, clock):
+    cache = SemanticCache(embedder, threshold=0.9)
+    await cache.store("intro to python", "result")
+
+    # Cosine similarity of about 0.71, below the threshold
+    assert await cache.lookup("python vs rust") is None
+    assert await cache.lookup("gardening") is None
+
+
+@pytest.mark.asyncio
+async def test_lower_threshold_accepts_looser_matches(embedder, clock):
+    cache = SemanticCache(embedder, threshold=0.7)
+    await cache.store("intro to python", "result")
+
+    assert await cache.lookup("python vs rust") == "result"
+
+
+@pytest.mark.asyncio
+async def test_best_match_wins(embedder, clock):
+    cache = SemanticCache(embedder, threshold=0.5)
+    await cache.store("python vs rust", "comparison")
+    await cache.store("intro to python", "intro")
+
+    assert await cache.lookup("python basics") == "intro"
+
+
+@pytest.mark.asyncio
+async def test_entries_expire(embedder, clock):
+    cache = SemanticCache(embedder, ttl=60)
+    await cache.store("intro to python", "result")
+
+    clock.now += 59
+    assert await cache.lookup("intro to python") == "result"
+    clock.now += 2
+    assert await cache.lookup("intro to python") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_does_not_shadow_live_one(embedder, clock):
+    cache = SemanticCache(embedder, threshold=0.9, ttl=60)
+    await cache.store("intro to python", "old")
+    clock.now += 30
+    await cache.store("python basics", "new")
+    clock.now += 31
+
+    assert await cache.lookup("intro to python") == "new"
+
+
+@pytest.mark.asyncio
+async def test_namespaces_are_isolated(embedder, clock):
+    cache = SemanticCache(embedder)
+    await cache.store("intro to python", "article", namespace="article")
+
+    assert await cache.lookup("intro to python", namespace="blog_post") is None
+    assert await cache.lookup("intro to python") is None
+
+    await cache.store("intro to python", "blog post", namespace="blog_post")
+    assert await cache.lookup("intro to python", namespace="article") == "article"
+    assert await cache.lookup("intro to python", namespace="blog_post") == "blog post"
+
+
+@pytest.mark.asyncio
+async def test_ring_overwrites_oldest_entry(embedder, clock):
+    cache = SemanticCache(embedder, max_entries=2)
+    await cache.store("first", 1)
+    await cache.store("second", 2)
+    await cache.store("third", 3)
+
+    assert await cache.lookup("first") is None
+    assert await cache.lookup("second") == 2
+    assert await cache.lookup("third") == 3
+
+    await cache.store("first", 4)
+    assert await cache.lookup("second") is None
+    assert await cache.lookup("third") == 3
+    assert await cache.lookup("first") == 4
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_is_a_miss(embedder, clock):
+    cache = SemanticCache(embedder)
+    await cache.store("unknown topic", "result")
+    await cache.store("intro to python", "result")
+
+    assert await cache.lookup("unknown topic") is None
+
+
+@pytest.mark.asyncio
+async def test_zero_vector_is_not_cached(embedder, clock):
+    cache = SemanticCache(embedder, threshold=0.0)
+    await cache.store("zero", "result")
+
+    assert await cache.lookup("zero") is None
+    assert await cache.lookup("intro to python") is None
+
+
+@pytest.mark.asyncio
+async def test_lookup_then_store_embeds_once(embedder, clock):
+    cache = SemanticCache(embedder)
+    await cache.store("gardening", "other")
+
+    assert await cache.lookup("intro to python") is None
+    await cache.store("intro to python", "result")
+    assert embedder.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_clear(embedder, clock):
+    cache = SemanticCache(embedder)
+    await cache.store("intro to python", "result")
+    cache.clear()
+
+    assert await cache.lookup("intro to python") is None
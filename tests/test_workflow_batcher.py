@@ -0,0 +1,128 @@
+"""Tests for BatchingGenerator"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.services.workflow_batcher import BatchingGenerator
+
+
+class StubAgentService:
+    """Records workflow calls; topics starting with "slow" or "fail" misbehave"""
+
+    def __init__(self):
+        self.calls = []
+        self.release_slow = asyncio.Event()
+
+    async def execute_content_workflow(self, topic, content_type="article"):
+        self.calls.append((topic, content_type))
+        if topic.startswith("slow"):
+            await self.release_slow.wait()
+        if topic.startswith("fail"):
+            raise RuntimeError(f"workflow failed for {topic}")
+        await asyncio.sleep(0)
+        return {"topic": topic, "content_type": content_type}
+
+
+@pytest_asyncio.fixture
+async def service_and_batcher():
+    service = StubAgentService()
+    batcher = BatchingGenerator(service, window=0.01)
+    yield service, batcher
+    service.release_slow.set()
+    await batcher.stop(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_workflow(service_and_batcher):
+    service, batcher = service_and_batcher
+    futures = [batcher.submit("python", "article") for _ in range(3)]
+    futures.append(batcher.submit("python", "blog_post"))
+
+    results = await asyncio.gather(*futures)
+
+    assert sorted(service.calls) == [("python", "article"), ("python", "blog_post")]
+    assert results[0] is results[1] is results[2]
+    assert results[3] == {"topic": "python", "content_type": "blog_post"}
+
+
+@pytest.mark.asyncio
+async def test_requests_resolve_independently(service_and_batcher):
+    service, batcher = service_and_batcher
+    slow = batcher.submit("slow topic")
+    fast = batcher.submit("fast topic")
+
+    assert (await asyncio.wait_for(fast, timeout=1))["topic"] == "fast topic"
+    assert not slow.done()
+
+    service.release_slow.set()
+    assert (await asyncio.wait_for(slow, timeout=1))["topic"] == "slow topic"
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter(service_and_batcher):
+    _, batcher = service_and_batcher
+    failing = [batcher.submit("fail topic") for _ in range(2)]
+    ok = batcher.submit("good topic")
+
+    for future in failing:
+        with pytest.raises(RuntimeError, match="fail topic"):
+            await future
+    assert (await ok)["topic"] == "good topic"
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped(service_and_batcher):
+    service, batcher = service_and_batcher
+    batcher.max_batch = 2
+    futures = [batcher.submit(f"topic {i}") for i in range(5)]
+
+    await asyncio.gather(*futures)
+    assert len(service.calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_abandoned_future_is_skipped(service_and_batcher):
+    _, batcher = service_and_batcher
+    abandoned = batcher.submit("python")
+    waiting = batcher.submit("python")
+    abandoned.cancel()
+
+    assert (await waiting)["topic"] == "python"
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_stuck_workflows():
+    service = StubAgentService()
+    batcher = BatchingGenerator(service, window=0.01)
+    stuck = batcher.submit("slow topic")
+    await asyncio.sleep(0.05)
+    assert service.calls
+
+    await asyncio.wait_for(batcher.stop(timeout=0.05), timeout=1)
+    assert stuck.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_queued_requests():
+    service = StubAgentService()
+    batcher = BatchingGenerator(service, window=10)
+    queued = batcher.submit("python")
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(batcher.stop(), timeout=1)
+    assert queued.cancelled()
+    assert not service.calls
+
+
+@pytest.mark.asyncio
+async def test_stop_lets_running_workflows_finish():
+    service = StubAgentService()
+    batcher = BatchingGenerator(service, window=0.01)
+    running = batcher.submit("slow topic")
+    await asyncio.sleep(0.05)
+
+    asyncio.get_running_loop().call_later(0.01, service.release_slow.set)
+    await batcher.stop(timeout=1)
+    assert (await running)["topic"] == "slow topic"